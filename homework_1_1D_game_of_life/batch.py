@@ -0,0 +1,118 @@
+import argparse
+import functools
+import random
+import sys
+import time
+import life
+import rng
+from config import ROW_CELLS
+
+def row_to_text(row):
+    """
+    Renders a row as a line of '0'/'1' characters, without a per-cell loop for packed or array rows.
+    """
+    if len(row) == 0:
+        return ""
+    if hasattr(row, "bits"):
+        return format(row.bits, "b").zfill(len(row))[::-1]
+    if hasattr(row, "tobytes"):
+        return (row.astype("uint8") + ord("0")).tobytes().decode("ascii")
+    return "".join("1" if cell else "0" for cell in row)
+
+def run(rule, width, generations, seed=None, engine="cell", out=None, final_only=False, neighborhood=None):
+    """
+    Runs `generations` steps of a single rule headlessly, starting from a random row of `width` cells.
+    Every row (including the initial one) is written to `out` when given, or only the last one
+    with `final_only`, in which case engines that can jump ahead skip the intermediate rows.
+    A `neighborhood` (radius/boundary/weights) other than the default needs the numpy engine.
+    Returns (final_row, step_seconds), where step_seconds only counts time spent inside the engine.
+    """
+    random.seed(seed)
+    rng.seed(seed)
+    apply = life.load_engine(engine)
+    if neighborhood is not None:
+        if engine != "numpy":
+            raise ValueError("Custom neighborhoods are only supported by the numpy engine")
+        apply = functools.partial(apply, neighborhood=neighborhood)
+    row = rng.random_row(width)
+    if out is not None and not final_only:
+        out.write(row_to_text(row) + "\n")
+    step_seconds = 0.0
+    if final_only and hasattr(apply, "advance"):
+        start = time.perf_counter()
+        row = apply.advance(rule, row, generations)
+        step_seconds += time.perf_counter() - start
+    else:
+        for _ in range(generations):
+            start = time.perf_counter()
+            row = apply(rule, row)
+            step_seconds += time.perf_counter() - start
+            rng.next_generation()
+            if out is not None and not final_only:
+                out.write(row_to_text(row) + "\n")
+    if out is not None and final_only:
+        out.write(row_to_text(row) + "\n")
+    return row, step_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless 1D Game of Life batch runner")
+    parser.add_argument("--rule", type=int, required=True, help="Rule index to use (0-indexed)")
+    parser.add_argument("--width", type=int, default=ROW_CELLS, help=f"Number of cells in a row (default: {ROW_CELLS})")
+    parser.add_argument("--generations", type=int, default=50, help="Number of generations to run (default: 50)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the initial row and random rules")
+    parser.add_argument("--engine", choices=life.ENGINE_NAMES, default="packed", help="Rule engine (default: packed)")
+    parser.add_argument("--output", default="-", help="File to stream rows to, '-' for stdout (default)")
+    parser.add_argument("--no-rows", action="store_true", help="Do not write rows, only report throughput")
+    parser.add_argument("--radius", type=int, default=2, help="Neighborhood radius (default: 2, numpy engine only otherwise)")
+    parser.add_argument("--boundary", choices=["clip", "wrap"], default="clip", help="Row ends: clip (missing cells are dead) or wrap (default: clip)")
+    parser.add_argument("--final-only", action="store_true", help="Only write the last row (lets hashlife jump straight there)")
+    args = parser.parse_args()
+
+    if not 0 <= args.rule < len(life.RULES):
+        parser.error(f"--rule must be between 0 and {len(life.RULES) - 1}")
+    if args.width < 1:
+        parser.error("--width must be at least 1")
+    if args.generations < 0:
+        parser.error("--generations must be 0 or more")
+    if args.radius < 1:
+        parser.error("--radius must be at least 1")
+    rule = life.RULES[args.rule]
+    if args.engine == "hashlife" and rule is life.random_flip_rule:
+        parser.error(f"--engine hashlife needs a deterministic rule, {rule.__name__} is random")
+    neighborhood = None
+    if args.radius != 2 or args.boundary != "clip":
+        if args.engine != "numpy":
+            parser.error("--radius/--boundary need --engine numpy")
+        from neighborhood import Neighborhood
+        neighborhood = Neighborhood(args.radius, args.boundary)
+
+    if args.no_rows:
+        out = None
+    elif args.output == "-":
+        out = sys.stdout
+    else:
+        out = open(args.output, "w")
+
+    start = time.perf_counter()
+    try:
+        _, step_seconds = run(rule, args.width, args.generations, args.seed, args.engine, out, args.final_only, neighborhood)
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    cells = args.width * args.generations
+    step_rate = cells / step_seconds if step_seconds > 0 else float("inf")
+    total_rate = cells / elapsed if elapsed > 0 else float("inf")
+    print(f"Rule: {rule.__name__}, engine: {args.engine}, width: {args.width}, generations: {args.generations}", file=sys.stderr)
+    print(f"Elapsed time: {elapsed:.3f} seconds ({step_seconds:.3f} in the engine)", file=sys.stderr)
+    print(f"Throughput: {step_rate:,.0f} cells/second stepping, {total_rate:,.0f} cells/second overall", file=sys.stderr)
+    engine = life.load_engine(args.engine)
+    if hasattr(engine, "stats"):
+        for name, stats in engine.stats().items():
+            print(f"Memo cache ({name}): {stats['hits']} hits, {stats['misses']} misses, "
+                  f"hit rate {stats['hit_rate']:.1%}, {stats['nodes']} nodes, "
+                  f"{stats['fallbacks']} fallbacks to stepping", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
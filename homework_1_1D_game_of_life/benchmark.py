@@ -0,0 +1,123 @@
+import argparse
+import csv
+import json
+import sys
+import time
+import life
+import rng
+
+DEFAULT_WIDTHS = [50, 1000, 100000, 10000000]
+# pure-Python engines would take minutes per step on the widest rows
+DEFAULT_MAX_WIDTH = {"cell": 100000, "hashlife": 100000}
+
+def measure(apply, rule, width, min_time=0.2, max_steps=1000):
+    """
+    Steps a random row with one engine until at least `min_time` seconds have passed
+    (after one warm-up step) and returns (cells_per_second, steps).
+    """
+    rng.seed(0)
+    row = apply(rule, rng.random_row(width))
+    steps = 0
+    elapsed = 0.0
+    while elapsed < min_time and steps < max_steps:
+        start = time.perf_counter()
+        row = apply(rule, row)
+        elapsed += time.perf_counter() - start
+        rng.next_generation()
+        steps += 1
+    return width * steps / elapsed if elapsed > 0 else float("inf"), steps
+
+def run_benchmarks(engines, rules, widths, min_time=0.2, max_width=None):
+    """
+    Times every rule x engine x width combination and returns a list of result dicts.
+    Combinations an engine cannot run (random rules on hashlife, missing NumPy,
+    widths above `max_width[engine]`) are skipped.
+    """
+    max_width = DEFAULT_MAX_WIDTH if max_width is None else max_width
+    results = []
+    for engine in engines:
+        try:
+            apply = life.load_engine(engine)
+        except ImportError as e:
+            print(f"Skipping engine {engine}: {e}", file=sys.stderr)
+            continue
+        for rule in rules:
+            if engine == "hashlife" and rule is life.random_flip_rule:
+                continue
+            for width in widths:
+                if width > max_width.get(engine, width):
+                    continue
+                cells_per_second, steps = measure(apply, rule, width, min_time)
+                results.append({
+                    "engine": engine,
+                    "rule": rule.__name__,
+                    "width": width,
+                    "steps": steps,
+                    "cells_per_second": cells_per_second,
+                })
+                print(f"{engine:<9}{rule.__name__:<24}{width:>10}{cells_per_second:>16,.0f} cells/s", file=sys.stderr)
+    return results
+
+def write_report(results, path):
+    """
+    Writes results as JSON, or as CSV when the path ends in .csv.
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["engine", "rule", "width", "steps", "cells_per_second"])
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+
+def read_report(path):
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            return [dict(r, width=int(r["width"]), cells_per_second=float(r["cells_per_second"]))
+                    for r in csv.DictReader(f)]
+    with open(path) as f:
+        return json.load(f)
+
+def find_regressions(results, baseline, max_regression):
+    """
+    Compares results with a baseline report. Returns (key, baseline_rate, rate) for every
+    combination whose throughput dropped by more than `max_regression` percent.
+    """
+    reference = {(r["engine"], r["rule"], r["width"]): r["cells_per_second"] for r in baseline}
+    regressions = []
+    for r in results:
+        key = (r["engine"], r["rule"], r["width"])
+        if key in reference and r["cells_per_second"] < reference[key] * (1 - max_regression / 100):
+            regressions.append((key, reference[key], r["cells_per_second"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark 1D life rules across row widths and engines")
+    parser.add_argument("--engines", nargs="*", choices=life.ENGINE_NAMES, default=life.ENGINE_NAMES, help="Engines to time (default: all)")
+    parser.add_argument("--rules", type=int, nargs="*", default=None, help="Rule indices to time (default: all)")
+    parser.add_argument("--widths", type=int, nargs="*", default=DEFAULT_WIDTHS, help=f"Row widths (default: {DEFAULT_WIDTHS})")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds measured per combination (default: 0.2)")
+    parser.add_argument("--no-width-limits", action="store_true", help="Also run the per-cell and hashlife engines on the widest rows")
+    parser.add_argument("--output", default="benchmark.json", help="Report file, .json or .csv (default: benchmark.json)")
+    parser.add_argument("--baseline", default=None, help="Baseline report to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="Allowed throughput drop against the baseline, in percent (default: 20)")
+    args = parser.parse_args()
+
+    rules = [life.RULES[i] for i in args.rules] if args.rules else life.RULES
+    max_width = {} if args.no_width_limits else None
+    results = run_benchmarks(args.engines, rules, args.widths, args.min_time, max_width)
+    write_report(results, args.output)
+    print(f"{len(results)} measurements written to {args.output}")
+
+    if args.baseline:
+        regressions = find_regressions(results, read_report(args.baseline), args.max_regression)
+        for (engine, rule, width), before, now in regressions:
+            print(f"REGRESSION {engine} {rule} width={width}: {before:,.0f} -> {now:,.0f} cells/s "
+                  f"({(1 - now / before):.0%} slower)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.max_regression}% against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from collections import deque
+import numpy as np
+
+def as_cells(row):
+    """
+    Any row representation (list, NumPy array or PackedRow) as a uint8 array, so equal rows
+    from different engines hash and compare equal.
+    """
+    if isinstance(row, np.ndarray):
+        return row.astype(np.uint8, copy=False)
+    return np.fromiter(row, dtype=np.uint8, count=len(row))
+
+def row_hash(row):
+    """
+    Hashes a row regardless of its representation (list, NumPy array or PackedRow).
+    """
+    return hash(as_cells(row).tobytes())
+
+def rows_equal(a, b):
+    return np.array_equal(as_cells(a), as_cells(b))
+
+class CycleDetector:
+    """
+    Detects fixed points and cycles of a deterministic rule by hashing every generated row.
+    Keeps at most `max_entries` recent rows (and their hash -> generation index), so cycles
+    with a period up to `max_entries` are found. Once a cycle is known, row_at() returns the
+    row of any later generation in O(1).
+    """
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.reset()
+
+    def reset(self):
+        self.generation = -1
+        self.transient = None
+        self.period = None
+        self._index = {}
+        self._rows = deque()
+
+    @property
+    def found(self):
+        return self.period is not None
+
+    def observe(self, row):
+        """
+        Records the row of the next generation (the first call is generation 0).
+        Returns True once a cycle has been detected.
+        """
+        if self.found:
+            return True
+        self.generation += 1
+        row = as_cells(row).copy()
+        key = row_hash(row)
+        first = self._index.get(key)
+        oldest = self.generation - len(self._rows)
+        if first is not None and rows_equal(self._rows[first - oldest], row):
+            self.transient = first
+            self.period = self.generation - first
+            # keep exactly the rows of one period
+            for _ in range(first - oldest):
+                self._rows.popleft()
+            self._rows = list(self._rows)
+            self._index = {}
+            return True
+        self._index[key] = self.generation
+        self._rows.append(row)
+        if len(self._rows) > self.max_entries:
+            evicted = self._rows.popleft()
+            old_key = row_hash(evicted)
+            if self._index.get(old_key) == self.generation - len(self._rows):
+                del self._index[old_key]
+        return False
+
+    def row_at(self, generation):
+        """
+        Returns the row of any generation from the start of the cycle on, once a cycle is known.
+        """
+        if not self.found:
+            raise ValueError("No cycle detected yet")
+        if generation < self.transient:
+            raise ValueError(f"Generation {generation} is before the cycle started at {self.transient}")
+        return self._rows[(generation - self.transient) % self.period]
@@ -1,19 +1,30 @@
 import pygame
-import random
 from config import WINDOW_WIDTH, WINDOW_HEIGHT, BOTTOM_BAR_HEIGHT, CELL_SIZE, ROW_CELLS, CANVAS_BG_COLOR, BOTTOM_BAR_BG_COLOR, ALIVE_COLOR, DEAD_COLOR
 from button import ButtonManager
-from life import step 
+import life
+import rng
+from life import step
+from cycle import CycleDetector
+from renderer import RowRenderer
+from history import RingHistory
+from life2d import Board
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, detect_cycles=False, spill_path=None):
         self.screen = screen
         self.cell_size = CELL_SIZE
         self.row_cells = ROW_CELLS
         self.canvas_height = WINDOW_HEIGHT - BOTTOM_BAR_HEIGHT
         self.max_rows = self.canvas_height // self.cell_size
-        self.history = []
-        initial_row = [random.choice([0, 1]) for _ in range(self.row_cells)]
+        self.history = RingHistory(self.max_rows, self.row_cells, spill_path)
+        initial_row = rng.random_row(self.row_cells)
         self.history.append(initial_row)
+        self.generation = 0
+        self.cycle_detector = CycleDetector() if detect_cycles else None
+        if self.cycle_detector is not None:
+            self.cycle_detector.observe(initial_row)
+        self.renderer = RowRenderer(WINDOW_WIDTH, self.canvas_height, self.cell_size, ALIVE_COLOR, DEAD_COLOR, CANVAS_BG_COLOR)
+        self.drawn_generation = -1
 
         self.button_manager = ButtonManager(WINDOW_WIDTH, WINDOW_HEIGHT, BOTTOM_BAR_HEIGHT)
         self.button_manager.set_callback("one", self.generate_one)
@@ -26,30 +37,80 @@ class Game:
         self.generate_generations(50)
 
     def generate_generations(self, count):
-        for _ in range(count):
+        detector = self.cycle_detector
+        done = 0
+        while done < count and not (detector is not None and detector.found):
             new_row = step(self.history[-1])
             self.history.append(new_row)
-        if len(self.history) > self.max_rows:
-            self.history = self.history[-self.max_rows:]
+            self.generation += 1
+            done += 1
+            if detector is not None and life.is_deterministic() and detector.observe(new_row):
+                print(f"Cycle found: transient {detector.transient}, period {detector.period}")
+        if done < count:
+            # fast-forward: only the rows that stay visible are looked up
+            target = self.generation + count - done
+            first_visible = max(self.generation + 1, target - self.max_rows + 1)
+            self.history.extend(detector.row_at(g) for g in range(first_visible, target + 1))
+            rng.next_generation(target - self.generation)
+            self.generation = target
 
     def handle_events(self, events):
         for event in events:
             self.button_manager.handle_event(event)
             if event.type == pygame.QUIT:
+                self.close()
                 pygame.quit()
                 exit()
 
+    def close(self):
+        self.history.close()
+
     def update(self):
         pass
 
     def draw(self):
-        pygame.draw.rect(self.screen, CANVAS_BG_COLOR, (0, 0, WINDOW_WIDTH, self.canvas_height))
-        for i, row in enumerate(self.history):
-            y = i * self.cell_size
-            for j, cell in enumerate(row):
-                x = j * self.cell_size
-                color = ALIVE_COLOR if cell == 1 else DEAD_COLOR
-                rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
-                pygame.draw.rect(self.screen, color, rect)
+        new_rows = min(self.generation - self.drawn_generation, len(self.history))
+        if new_rows > 0:
+            self.renderer.add_rows(self.history[-new_rows:], len(self.history))
+            self.drawn_generation = self.generation
+        self.renderer.draw(self.screen)
+        pygame.draw.rect(self.screen, BOTTOM_BAR_BG_COLOR, (0, self.canvas_height, WINDOW_WIDTH, BOTTOM_BAR_HEIGHT))
+        self.button_manager.draw(self.screen)
+
+class Game2D(Game):
+    """
+    The same window and buttons, showing a 2D board instead of the 1D space-time diagram.
+    The board only recomputes active cells and only the cells that changed are repainted.
+    """
+    def __init__(self, screen, rule):
+        self.screen = screen
+        self.cell_size = CELL_SIZE
+        self.canvas_height = WINDOW_HEIGHT - BOTTOM_BAR_HEIGHT
+        self.board = Board.random(self.canvas_height // self.cell_size, ROW_CELLS, rule)
+        self.generation = 0
+        self.surface = pygame.Surface((WINDOW_WIDTH, self.canvas_height))
+        self.surface.fill(CANVAS_BG_COLOR)
+        self.surface.fill(DEAD_COLOR, (0, 0, self.board.cols * self.cell_size, self.board.rows * self.cell_size))
+        self.dirty = set(self.board.alive)
+
+        self.button_manager = ButtonManager(WINDOW_WIDTH, WINDOW_HEIGHT, BOTTOM_BAR_HEIGHT)
+        self.button_manager.set_callback("one", self.generate_one)
+        self.button_manager.set_callback("fifty", self.generate_fifty)
+
+    def generate_generations(self, count):
+        for _ in range(count):
+            self.dirty |= self.board.step()
+            self.generation += 1
+
+    def close(self):
+        pass
+
+    def draw(self):
+        alive = self.board.alive
+        size = self.cell_size
+        for r, c in self.dirty:
+            self.surface.fill(ALIVE_COLOR if (r, c) in alive else DEAD_COLOR, (c * size, r * size, size, size))
+        self.dirty = set()
+        self.screen.blit(self.surface, (0, 0))
         pygame.draw.rect(self.screen, BOTTOM_BAR_BG_COLOR, (0, self.canvas_height, WINDOW_WIDTH, BOTTOM_BAR_HEIGHT))
         self.button_manager.draw(self.screen)
@@ -0,0 +1,101 @@
+import os
+import numpy as np
+
+def packed_width(width):
+    return (width + 7) // 8
+
+def open_spill(path, width):
+    """
+    Opens a spill file written by RingHistory as a read-only memory map of shape
+    (generations, packed_width(width)). Rows are unpacked on demand with unpack_rows().
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.zeros((0, packed_width(width)), dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r").reshape(-1, packed_width(width))
+
+def unpack_rows(packed, width):
+    """
+    Turns bit-packed rows (one row per line of `packed`) back into 0/1 uint8 cells.
+    """
+    return np.unpackbits(packed, axis=-1, count=width, bitorder="little")
+
+class RingHistory:
+    """
+    Fixed-capacity history of the last `capacity` rows, stored in one (capacity, width)
+    uint8 array used as a ring buffer, so appending never copies the whole history.
+    With `spill_path`, rows that fall out of the buffer are appended bit-packed
+    (1 bit per cell) to that file, which can be re-opened with open_spill().
+
+    Behaves like the list it replaces: len(), history[-1] and history[-k:] work
+    (indexing returns views into the buffer, slices return a list of them).
+    """
+    def __init__(self, capacity, width, spill_path=None):
+        self.capacity = capacity
+        self.width = width
+        self.buffer = np.zeros((capacity, width), dtype=np.uint8)
+        self.start = 0
+        self.count = 0
+        self.total = 0
+        self.spill_path = spill_path
+        self.spill_file = open(spill_path, "wb") if spill_path else None
+
+    def __len__(self):
+        return self.count
+
+    def _slot(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("history index out of range")
+        return (self.start + i) % self.capacity
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.buffer[self._slot(k)] for k in range(*i.indices(self.count))]
+        return self.buffer[self._slot(i)]
+
+    def __iter__(self):
+        for k in range(self.count):
+            yield self.buffer[(self.start + k) % self.capacity]
+
+    def append(self, row):
+        if self.count == self.capacity:
+            if self.spill_file is not None:
+                self.spill_file.write(np.packbits(self.buffer[self.start], bitorder="little").tobytes())
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        else:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        self.buffer[slot] = np.fromiter(row, dtype=np.uint8, count=self.width)
+        self.total += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    @property
+    def spilled(self):
+        """
+        Number of generations that left the buffer (and were spilled, if enabled).
+        """
+        return self.total - self.count
+
+    def row_at(self, generation):
+        """
+        Returns the `generation`-th appended row, from the buffer or from the spill file.
+        (Rows skipped by a cycle fast-forward were never appended and are not counted.)
+        """
+        if not 0 <= generation < self.total:
+            raise IndexError(f"Generation {generation} has not been generated")
+        if generation >= self.spilled:
+            return self.buffer[(self.start + generation - self.spilled) % self.capacity]
+        if self.spill_file is None:
+            raise IndexError(f"Generation {generation} was evicted and spilling is disabled")
+        self.spill_file.flush()
+        return unpack_rows(open_spill(self.spill_path, self.width)[generation], self.width)
+
+    def close(self):
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
@@ -0,0 +1,105 @@
+import numpy as np
+import life
+import life_vectorized
+import rng
+
+MOORE_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)]
+
+def conway_rule(cells, sums, hood):
+    # B3/S23: born with exactly 3 neighbors, survives with 2 or 3
+    return (sums == 3) | ((cells == 1) & (sums == 2))
+
+def is_totalistic(rule):
+    """
+    True when a life.py rule only depends on the cell's own state and its neighbor count
+    (no index parity, weights, positions or random draws), so it has a 2D meaning.
+    """
+    return rule in life_vectorized.VECTORIZED_RULES and rule not in (
+        life.alternating_rule, life.weighted_rule, life.random_flip_rule, life.mirror_rule)
+
+def array_rule(rule):
+    """
+    The vectorized (cells, sums, hood) form of a 2D rule: conway_rule or a totalistic life.py rule.
+    """
+    if rule is conway_rule:
+        return conway_rule
+    if not is_totalistic(rule):
+        raise ValueError(f"Rule {rule.__name__} is not totalistic and has no 2D version")
+    return life_vectorized.VECTORIZED_RULES[rule]
+
+def is_quiescent(rule):
+    """
+    True when a dead cell with no alive neighbors stays dead, which the sparse engine needs:
+    otherwise empty regions would change too and there is nothing sparse to exploit.
+    """
+    return not array_rule(rule)(np.zeros(1, dtype=np.uint8), np.zeros(1, dtype=np.int32), None)[0]
+
+RULES_2D = [conway_rule] + [rule for rule in life.RULES if is_totalistic(rule) and is_quiescent(rule)]
+
+class Board:
+    """
+    A rows x cols board (cells outside it are dead) evolved by a totalistic rule over the
+    8-cell Moore neighborhood. Only alive cells are stored, and each generation only the
+    "active" cells are recomputed: the cells that changed last generation and their
+    neighbors. Everything else cannot change, so the cost follows activity, not area.
+    """
+    def __init__(self, rows, cols, rule=conway_rule, alive=()):
+        if not is_quiescent(rule):
+            raise ValueError(f"Rule {rule.__name__} turns empty space alive, the sparse engine cannot run it")
+        self.rows = rows
+        self.cols = cols
+        self.rule = rule
+        self.apply = array_rule(rule)
+        self.alive = set(alive)
+        self.generation = 0
+        # cells whose state changed in the last generation (all alive cells to start with)
+        self.changed = set(self.alive)
+
+    @classmethod
+    def random(cls, rows, cols, rule=conway_rule, density=0.25):
+        """
+        A board with every cell alive with probability `density`, keyed only by the rng seed.
+        """
+        alive = np.flatnonzero(rng.uniforms(rng.INITIAL_ROW, rows * cols) < density)
+        return cls(rows, cols, rule, ((int(i) // cols, int(i) % cols) for i in alive))
+
+    def neighbors(self, cell):
+        r, c = cell
+        for dr, dc in MOORE_OFFSETS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                yield nr, nc
+
+    def active_cells(self):
+        active = set(self.changed)
+        for cell in self.changed:
+            active.update(self.neighbors(cell))
+        return active
+
+    def step(self):
+        """
+        Advances one generation and returns the set of cells that changed.
+        """
+        alive = self.alive
+        active = list(self.active_cells())
+        states = np.fromiter((cell in alive for cell in active), dtype=np.uint8, count=len(active))
+        counts = np.fromiter((sum(n in alive for n in self.neighbors(cell)) for cell in active),
+                             dtype=np.int32, count=len(active))
+        new_states = np.asarray(self.apply(states, counts, None), dtype=np.uint8)
+        changed = set()
+        for k in np.flatnonzero(new_states != states):
+            cell = active[k]
+            if new_states[k]:
+                alive.add(cell)
+            else:
+                alive.discard(cell)
+            changed.add(cell)
+        self.changed = changed
+        self.generation += 1
+        return changed
+
+    def to_array(self):
+        grid = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        for r, c in self.alive:
+            grid[r, c] = 1
+        return grid
@@ -0,0 +1,286 @@
+import life_packed
+import life_table
+import rng
+
+# When the memo cache fills up during a run with a hit rate below this, or fills up a second
+# time in the same run, memoizing is not paying off (chaotic rule) and the rest of the run
+# is stepped one generation at a time instead. The same happens once a run has computed
+# more new blocks than a quarter of its generations: a cache miss costs about as much as
+# four packed steps, so plain stepping is then cheaper.
+MIN_HIT_RATE = 0.5
+# cache misses a run may always spend, so short runs on fresh caches still get memoized
+MIN_BUDGET = 100000
+
+class MemoCollapse(Exception):
+    pass
+
+# Cells outside the row. They never change and count as missing neighbors,
+# which reproduces the `0 <= idx < len(row)` bounds checks of the per-cell rules.
+VOID = 2
+
+class Node:
+    """
+    A canonical block of 2**level cells. Level-2 nodes are leaves holding 4 cell states,
+    higher nodes are the join of two canonical half-blocks. Equal blocks are the same object,
+    so identity hashing is enough to memoize results.
+    """
+    __slots__ = ("level", "left", "right", "cells")
+
+    def __init__(self, level, left=None, right=None, cells=None):
+        self.level = level
+        self.left = left
+        self.right = right
+        self.cells = cells
+
+class HashLife:
+    """
+    Hashlife-style engine for one deterministic radius-2 rule on a single row.
+
+    advance(node, j) returns the center half of a level-k node advanced by 2**j generations
+    (j <= k - 3: the radius-2 light cone eats 2 cells per side per generation, so a 2**k block
+    determines its center 2**(k-1) cells for 2**(k-3) generations). Results are memoized per
+    (node, j), which makes structured patterns cost far less than one step per generation.
+
+    Memory is bounded by `max_results`: whenever the cache reaches it, it is dropped (nodes
+    already built stay valid, they just stop being shared). If the run's hit rate is below
+    MIN_HIT_RATE at that point, or the cache already filled once in this run, or the run has
+    missed the cache more than generations / 4 times, the rest of the run falls back to
+    stepping (bit-packed rows when the rule has a packed version, else the lookup table).
+    """
+    def __init__(self, rule, max_results=1000000):
+        compiled = life_table.compile_rule(rule)
+        if compiled.flip_probability:
+            raise ValueError(f"Rule {compiled.name} is random, hashlife needs a deterministic rule")
+        self.rule = rule
+        self.compiled = compiled
+        self.name = compiled.name
+        self.table = compiled.table.tolist()
+        self.max_results = max_results
+        self.fallbacks = 0
+        self.clear_cache()
+
+    def _drop_memo(self):
+        self._leaves = {}
+        self._joins = {}
+        self._results = {}
+        self._voids = {}
+
+    def clear_cache(self):
+        self._drop_memo()
+        self.hits = 0
+        self.misses = 0
+        self._run_hits = 0
+        self._run_misses = 0
+        self._run_drops = 0
+        self._run_budget = MIN_BUDGET
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "nodes": len(self._leaves) + len(self._joins),
+            "fallbacks": self.fallbacks,
+        }
+
+    # canonical nodes
+
+    def leaf(self, cells):
+        cells = tuple(cells)
+        node = self._leaves.get(cells)
+        if node is None:
+            node = self._leaves[cells] = Node(2, cells=cells)
+        return node
+
+    def join(self, left, right):
+        key = (left, right)
+        node = self._joins.get(key)
+        if node is None:
+            node = self._joins[key] = Node(left.level + 1, left, right)
+        return node
+
+    def void(self, level):
+        if level not in self._voids:
+            if level == 2:
+                self._voids[level] = self.leaf((VOID,) * 4)
+            else:
+                half = self.void(level - 1)
+                self._voids[level] = self.join(half, half)
+        return self._voids[level]
+
+    def build(self, cells, level):
+        """
+        Builds the canonical node of 2**level cells from a flat list of cell states.
+        """
+        nodes = [self.leaf(cells[i:i + 4]) for i in range(0, 1 << level, 4)]
+        while len(nodes) > 1:
+            nodes = [self.join(nodes[i], nodes[i + 1]) for i in range(0, len(nodes), 2)]
+        return nodes[0]
+
+    def flatten(self, node, count):
+        """
+        Returns the first `count` cell states of a node.
+        """
+        cells = []
+        stack = [node]
+        while stack and len(cells) < count:
+            node = stack.pop()
+            if node.level == 2:
+                cells.extend(node.cells)
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+        return cells[:count]
+
+    # evolution
+
+    def _base(self, node):
+        # level 3 (8 cells) -> its center 4 cells one generation later
+        cells = node.left.cells + node.right.cells
+        new_cells = []
+        for p in range(2, 6):
+            if cells[p] == VOID:
+                new_cells.append(VOID)
+                continue
+            window = cells[p - 2:p + 3]
+            missing_left = window[:2].count(VOID)
+            missing_right = window[3:].count(VOID)
+            code = 0
+            for k, cell in enumerate(window):
+                if cell == 1:
+                    code |= 1 << k
+            # blocks always start at an even offset from the row start, so p % 2 is the index parity
+            kind = 3 * missing_left + missing_right
+            new_cells.append(self.table[(kind * 2 + p % 2) * life_table.WINDOW_CODES + code])
+        return self.leaf(new_cells)
+
+    def _center(self, node):
+        # the center half of a node, without advancing time
+        if node.level == 3:
+            return self.leaf(node.left.cells[2:] + node.right.cells[:2])
+        return self.join(node.left.right, node.right.left)
+
+    def advance(self, node, j):
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if self.misses - self._run_misses > self._run_budget:
+            raise MemoCollapse()
+        if len(self._results) + len(self._joins) >= self.max_results:
+            self._make_room()
+
+        if node.level == 3:
+            result = self._base(node)
+        else:
+            a, b = node.left, node.right
+            middle = self.join(a.right, b.left)
+            full_speed = j == node.level - 3
+            if full_speed:
+                # two half-steps of 2**(j-1) generations each
+                r1 = self.advance(a, j - 1)
+                r2 = self.advance(middle, j - 1)
+                r3 = self.advance(b, j - 1)
+                j_next = j - 1
+            else:
+                r1, r2, r3 = self._center(a), self._center(middle), self._center(b)
+                j_next = j
+            result = self.join(self.advance(self.join(r1, r2), j_next),
+                               self.advance(self.join(r2, r3), j_next))
+        self._results[key] = result
+        return result
+
+    def _make_room(self):
+        run_hits = self.hits - self._run_hits
+        run_lookups = run_hits + self.misses - self._run_misses
+        if self._run_drops or run_hits < MIN_HIT_RATE * run_lookups:
+            raise MemoCollapse()
+        self._run_drops += 1
+        self._drop_memo()
+
+    def run(self, row, generations):
+        """
+        Returns the row (list of 0/1) after `generations` steps.
+        """
+        n = len(row)
+        if generations == 0 or n == 0:
+            return list(row)
+        self._run_hits = self.hits
+        self._run_misses = self.misses
+        self._run_drops = 0
+        self._run_budget = max(generations // 4, MIN_BUDGET)
+        # the row sits at offset 2**(level-2) and fits in one quarter of the root
+        level = max(4, (n - 1).bit_length() + 2, generations.bit_length() + 2)
+        row_level = max(2, (n - 1).bit_length())
+        cells = [int(c) for c in row] + [VOID] * ((1 << row_level) - n)
+        block = self.build(cells, row_level)
+        while block.level < level - 2:
+            block = self.join(block, self.void(block.level))
+        root = self.join(self.join(self.void(level - 2), block), self.void(level - 1))
+        padding = self.void(level - 2)
+        j = 0
+        try:
+            while generations:
+                if generations & 1:
+                    # the result holds the row at offset 0, pad it back into a full-size root
+                    result = self.advance(root, j)
+                    root = self.join(self.join(padding, result.left), self.join(result.right, padding))
+                generations >>= 1
+                j += 1
+        except MemoCollapse:
+            # root is still the row after the low bits already applied
+            self._drop_memo()
+            self.fallbacks += 1
+            row = self.flatten(self._center(root), n)
+            step = life_packed.apply_rule if self.rule in life_packed.PACKED_RULES else life_table.apply_rule
+            rule = self.rule if step is life_packed.apply_rule else self.compiled
+            for _ in range(generations << j):
+                row = step(rule, row)
+            return [int(c) for c in row]
+        return self.flatten(self._center(root), n)
+
+def is_random(rule):
+    return life_table.compile_rule(rule).flip_probability > 0
+
+class HashLifeEngine:
+    """
+    Engine for life.step (a callable(rule, row) -> new_row) that also supports jumping ahead
+    many generations at once with advance(). Keeps one memoized HashLife per rule.
+    Random rules cannot be memoized; they are stepped through the lookup-table engine, so
+    the GUI's random rule picks keep working with --engine hashlife.
+    """
+    def __init__(self):
+        self.engines = {}
+
+    def for_rule(self, rule):
+        if rule not in self.engines:
+            self.engines[rule] = HashLife(rule)
+        return self.engines[rule]
+
+    def __call__(self, rule, row):
+        if is_random(rule):
+            return life_table.apply_rule(rule, row)
+        return self.for_rule(rule).run(row, 1)
+
+    def advance(self, rule, row, generations):
+        """
+        Jumps `generations` generations ahead and moves rng's generation on by as many,
+        the same as stepping there one generation at a time.
+        """
+        if is_random(rule):
+            for _ in range(generations):
+                row = life_table.apply_rule(rule, row)
+                rng.next_generation()
+            return row
+        row = self.for_rule(rule).run(row, generations)
+        rng.next_generation(generations)
+        return row
+
+    def stats(self):
+        return {engine.name: engine.stats() for engine in self.engines.values()}
+
+engine = HashLifeEngine()
+apply_rule = engine
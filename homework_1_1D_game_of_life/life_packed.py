@@ -0,0 +1,225 @@
+import life
+import rng
+
+class PackedRow:
+    """
+    A row of 0/1 cells stored as the bits of a single Python int (bit i = cell i).
+    Uses about one bit per cell instead of a list slot per cell, and still behaves
+    like a sequence (len, indexing, iteration) so it can be drawn and stepped like a list.
+    """
+    __slots__ = ("bits", "width")
+
+    def __init__(self, bits, width):
+        self.bits = bits
+        self.width = width
+
+    @classmethod
+    def from_cells(cls, row):
+        if isinstance(row, PackedRow):
+            return row
+        width = len(row)
+        if width == 0:
+            return cls(0, 0)
+        return cls(int("".join("1" if cell else "0" for cell in reversed(row)), 2), width)
+
+    def to_list(self):
+        if self.width == 0:
+            return []
+        return [int(c) for c in reversed(format(self.bits, "b").zfill(self.width))]
+
+    def __len__(self):
+        return self.width
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.width
+        if not 0 <= i < self.width:
+            raise IndexError("PackedRow index out of range")
+        return (self.bits >> i) & 1
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        if isinstance(other, PackedRow):
+            return self.bits == other.bits and self.width == other.width
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.bits, self.width))
+
+    def __repr__(self):
+        return f"PackedRow(width={self.width}, alive={bin(self.bits).count('1')})"
+
+_even_masks = {}
+
+def even_index_mask(width):
+    """
+    Bit mask with every even cell index set (0b...0101), cached per width.
+    """
+    if width not in _even_masks:
+        _even_masks[width] = ((1 << (width + width % 2)) - 1) // 3
+    return _even_masks[width]
+
+class Window:
+    """
+    The radius-2 window of every cell as bit planes, plus the neighbor count
+    in binary (s0 + 2*s1 + 4*s2) built with word-parallel full/half adders.
+    """
+    def __init__(self, row):
+        x = row.bits
+        self.width = row.width
+        self.mask = (1 << row.width) - 1
+        self.cells = x
+        self.left2 = (x << 2) & self.mask
+        self.left1 = (x << 1) & self.mask
+        self.right1 = x >> 1
+        self.right2 = x >> 2
+
+        a, b, c, d = self.left2, self.left1, self.right1, self.right2
+        # full adder a + b + c
+        ab = a ^ b
+        partial = ab ^ c
+        carry = (a & b) | (c & ab)
+        # half adder with d
+        self.s0 = partial ^ d
+        carry_d = partial & d
+        self.s1 = carry ^ carry_d
+        self.s2 = carry & carry_d
+
+    def invert(self, bits):
+        return ~bits & self.mask
+
+    def at_least_one(self):
+        return self.left2 | self.left1 | self.right1 | self.right2
+
+    def at_least_two(self):
+        return self.s1 | self.s2
+
+    def at_least_three(self):
+        return (self.s1 & self.s0) | self.s2
+
+    def exactly_two(self):
+        return self.s1 & self.invert(self.s0)
+
+    def exactly_three(self):
+        return self.s1 & self.s0
+
+    def zero(self):
+        return self.invert(self.at_least_one())
+
+    def at_most_one(self):
+        return self.invert(self.at_least_two())
+
+# PACKED RULES
+# Each function takes a Window and returns the bits of the next row.
+
+def two_neighbors(w):
+    return w.at_least_two()
+
+def three_neighbors(w):
+    return w.at_least_three()
+
+def exactly_two_neighbors(w):
+    return w.exactly_two()
+
+def exactly_three_neighbors(w):
+    return w.exactly_three()
+
+def at_least_one_neighbor(w):
+    return w.at_least_one()
+
+def at_most_one_neighbor(w):
+    return w.at_most_one()
+
+def even_neighbors(w):
+    return w.invert(w.s0)
+
+def odd_neighbors(w):
+    return w.s0
+
+def divisible_by_three(w):
+    return w.zero() | w.exactly_three()
+
+def majority_rule(w):
+    return w.at_least_three()
+
+def minority_rule(w):
+    return w.at_most_one()
+
+def always_dead_rule(w):
+    return 0
+
+def always_alive_rule(w):
+    return w.mask
+
+def copy_rule(w):
+    return w.cells
+
+def sum_plus_self_rule(w):
+    return w.at_least_two() | (w.cells & w.at_least_one())
+
+def double_threshold_rule(w):
+    return (w.cells & w.at_least_two()) | (w.invert(w.cells) & w.at_least_three())
+
+def alternating_rule(w):
+    even = even_index_mask(w.width)
+    return (even & w.at_least_two()) | (w.invert(even) & w.at_least_one())
+
+def weighted_rule(w):
+    # inner neighbors weigh 1, outer 0.5: >= 2 means both inner, or one inner and both outer
+    inner_both = w.left1 & w.right1
+    inner_one = w.left1 ^ w.right1
+    return inner_both | (inner_one & w.left2 & w.right2)
+
+def random_flip_rule(w):
+    flips = PackedRow.from_cells(rng.flip_mask(w.width, 0.3))
+    return w.at_least_two() ^ flips.bits
+
+def zero_rule(w):
+    return w.zero()
+
+def inverted_rule(w):
+    return w.at_most_one()
+
+def parity_rule(w):
+    return w.invert(w.s0 ^ w.cells)
+
+def mirror_rule(w):
+    return w.left1 | (w.cells & 1)
+
+PACKED_RULES = {
+    life.two_neighbors: two_neighbors,
+    life.three_neighbors: three_neighbors,
+    life.exactly_two_neighbors: exactly_two_neighbors,
+    life.exactly_three_neighbors: exactly_three_neighbors,
+    life.at_least_one_neighbor: at_least_one_neighbor,
+    life.at_most_one_neighbor: at_most_one_neighbor,
+    life.even_neighbors: even_neighbors,
+    life.odd_neighbors: odd_neighbors,
+    life.divisible_by_three: divisible_by_three,
+    life.majority_rule: majority_rule,
+    life.minority_rule: minority_rule,
+    life.always_dead_rule: always_dead_rule,
+    life.always_alive_rule: always_alive_rule,
+    life.copy_rule: copy_rule,
+    life.sum_plus_self_rule: sum_plus_self_rule,
+    life.double_threshold_rule: double_threshold_rule,
+    life.alternating_rule: alternating_rule,
+    life.weighted_rule: weighted_rule,
+    life.random_flip_rule: random_flip_rule,
+    life.zero_rule: zero_rule,
+    life.inverted_rule: inverted_rule,
+    life.parity_rule: parity_rule,
+    life.mirror_rule: mirror_rule,
+}
+
+def apply_rule(rule, row):
+    """
+    Applies a life.py rule to a whole row with bitwise operations and returns a PackedRow.
+    Accepts a PackedRow or a plain list of 0/1; the result is identical to life.apply_rule.
+    """
+    if rule not in PACKED_RULES:
+        raise ValueError(f"No packed version of rule {rule.__name__}")
+    row = PackedRow.from_cells(row)
+    return PackedRow(PACKED_RULES[rule](Window(row)), row.width)
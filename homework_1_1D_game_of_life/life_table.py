@@ -0,0 +1,138 @@
+import hashlib
+import numpy as np
+import life
+import rng
+
+WINDOW_CELLS = 5
+WINDOW_CODES = 1 << WINDOW_CELLS
+# interior cells plus every combination of 0-2 missing cells at the left/right border
+EDGE_KINDS = 9
+TABLE_SIZE = EDGE_KINDS * 2 * WINDOW_CODES
+
+class CompiledRule:
+    """
+    A rule turned into a lookup table over (edge kind, index parity, 5-cell window code).
+    The window code has bit k set when cell i-2+k is alive; cells outside the row are 0.
+    The edge kind is 3 * missing_left + missing_right, so border cells that a rule treats
+    specially (like mirror_rule at index 0) are tabulated separately from interior cells.
+    Random rules are stored as a deterministic table plus a flip probability.
+    """
+    def __init__(self, name, table, flip_probability=0.0):
+        self.name = name
+        self.table = np.asarray(table, dtype=np.uint8)
+        if self.table.shape != (TABLE_SIZE,):
+            raise ValueError(f"Compiled table must have {TABLE_SIZE} entries, got {self.table.shape}")
+        self.flip_probability = flip_probability
+        digest = hashlib.sha1(self.table.tobytes() + repr(flip_probability).encode()).hexdigest()
+        self.rule_id = f"lut-{digest[:16]}"
+
+    def __repr__(self):
+        return f"CompiledRule({self.name}, {self.rule_id})"
+
+def _edge_kind(missing_left, missing_right):
+    return 3 * missing_left + missing_right
+
+def tabulate(rule):
+    """
+    Calls a per-cell rule (new_row, i, row) -> new_row on every possible window and returns
+    its TABLE_SIZE-entry lookup table.
+    """
+    table = [0] * TABLE_SIZE
+    for missing_left in range(3):
+        for missing_right in range(3):
+            present = range(missing_left, WINDOW_CELLS - missing_right)
+            for parity in range(2):
+                if missing_left > 0:
+                    # the cell sits at index 0 or 1, so its parity is fixed
+                    i = 2 - missing_left
+                    if i % 2 != parity:
+                        continue
+                    pad = 0
+                else:
+                    # cells left of the window do not matter, use them to set the parity
+                    pad = parity
+                    i = pad + 2
+                for code in range(WINDOW_CODES):
+                    if any(code >> k & 1 for k in range(WINDOW_CELLS) if k not in present):
+                        continue
+                    row = [0] * pad + [code >> k & 1 for k in present]
+                    index = (_edge_kind(missing_left, missing_right) * 2 + parity) * WINDOW_CODES + code
+                    table[index] = rule([], i, row)[-1]
+    return table
+
+def expand_table(table):
+    """
+    Expands a 32-entry (window only) or 64-entry (parity * 32 + window) table to TABLE_SIZE entries.
+    Missing border cells are treated as dead, like the neighbor bounds checks in life.py.
+    """
+    table = list(table)
+    if len(table) == WINDOW_CODES:
+        table = table + table
+    if len(table) != 2 * WINDOW_CODES:
+        raise ValueError(f"Rule table must have {WINDOW_CODES} or {2 * WINDOW_CODES} entries, got {len(table)}")
+    return table * EDGE_KINDS
+
+_registry = {}
+
+def register_rule(rule, table=None, flip_probability=0.0, name=None):
+    """
+    Compiles and registers a rule. `rule` is either a per-cell callable from life.py style code
+    (auto-tabulated unless `table` is given) or any hashable key when a `table` is provided.
+    Returns the CompiledRule.
+    """
+    if name is None:
+        name = getattr(rule, "__name__", str(rule))
+    if table is None:
+        full_table = tabulate(rule)
+    else:
+        full_table = expand_table(table)
+    compiled = CompiledRule(name, full_table, flip_probability)
+    _registry[rule] = compiled
+    return compiled
+
+def compile_rule(rule):
+    """
+    Returns the CompiledRule for a rule, tabulating and registering unknown callables on first use.
+    """
+    if isinstance(rule, CompiledRule):
+        return rule
+    if rule not in _registry:
+        register_rule(rule)
+    return _registry[rule]
+
+for _rule in life.RULES:
+    if _rule is life.random_flip_rule:
+        # two_neighbors, then a 30% flip per cell
+        register_rule(_rule, table=tabulate(life.two_neighbors)[:2 * WINDOW_CODES], flip_probability=0.3)
+    else:
+        register_rule(_rule)
+
+def window_codes(cells):
+    padded = np.zeros(len(cells) + 4, dtype=np.uint8)
+    padded[2:len(cells) + 2] = cells
+    n = len(cells)
+    return (padded[0:n] | padded[1:n + 1] << 1 | padded[2:n + 2] << 2
+            | padded[3:n + 3] << 3 | padded[4:n + 4] << 4)
+
+def table_index(cells):
+    """
+    Returns the lookup-table index of every cell: window code, parity and edge kind.
+    """
+    n = len(cells)
+    index = np.arange(n)
+    missing_left = np.clip(2 - index, 0, None)
+    missing_right = np.clip(index + 3 - n, 0, None)
+    kind = 3 * missing_left + missing_right
+    return (kind * 2 + index % 2) * WINDOW_CODES + window_codes(cells)
+
+def apply_rule(rule, row):
+    """
+    Applies a rule through its lookup table and returns the new row as a uint8 array.
+    The result is identical to life.apply_rule(rule, row), including random_flip_rule's flips.
+    """
+    compiled = compile_rule(rule)
+    cells = np.asarray(row, dtype=np.uint8)
+    new_cells = compiled.table[table_index(cells)]
+    if compiled.flip_probability:
+        new_cells ^= rng.flip_mask(len(cells), compiled.flip_probability).astype(np.uint8)
+    return new_cells
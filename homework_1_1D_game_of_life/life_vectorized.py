@@ -0,0 +1,133 @@
+import numpy as np
+import life
+import rng
+from neighborhood import DEFAULT_NEIGHBORHOOD
+
+def as_cells(row):
+    """
+    Converts a row (list of 0/1, or an array) into a uint8 NumPy array.
+    """
+    return np.asarray(row, dtype=np.uint8)
+
+def neighbor_sum(cells, neighborhood=DEFAULT_NEIGHBORHOOD):
+    """
+    Returns the number of alive neighbors of every cell at once. With the default neighborhood
+    (positions -2, -1, +1, +2, cells outside the row dead) this matches the bounds checks in life.py.
+    """
+    return neighborhood.sum(cells)
+
+def even_index_mask(n):
+    return np.arange(n) % 2 == 0
+
+# VECTORIZED RULES
+# Each function takes the current cells, their neighbor sums and the Neighborhood
+# the sums were computed with, and returns the next row.
+
+def two_neighbors(cells, sums, hood):
+    return sums >= 2
+
+def three_neighbors(cells, sums, hood):
+    return sums >= 3
+
+def exactly_two_neighbors(cells, sums, hood):
+    return sums == 2
+
+def exactly_three_neighbors(cells, sums, hood):
+    return sums == 3
+
+def at_least_one_neighbor(cells, sums, hood):
+    return sums >= 1
+
+def at_most_one_neighbor(cells, sums, hood):
+    return sums <= 1
+
+def even_neighbors(cells, sums, hood):
+    return sums % 2 == 0
+
+def odd_neighbors(cells, sums, hood):
+    return sums % 2 == 1
+
+def divisible_by_three(cells, sums, hood):
+    return sums % 3 == 0
+
+def majority_rule(cells, sums, hood):
+    return sums > 2
+
+def minority_rule(cells, sums, hood):
+    return sums < 2
+
+def always_dead_rule(cells, sums, hood):
+    return np.zeros(len(cells), dtype=np.uint8)
+
+def always_alive_rule(cells, sums, hood):
+    return np.ones(len(cells), dtype=np.uint8)
+
+def copy_rule(cells, sums, hood):
+    return cells.copy()
+
+def sum_plus_self_rule(cells, sums, hood):
+    return sums + cells >= 2
+
+def double_threshold_rule(cells, sums, hood):
+    return np.where(cells == 1, sums >= 2, sums >= 3)
+
+def alternating_rule(cells, sums, hood):
+    return np.where(even_index_mask(len(cells)), sums >= 2, sums >= 1)
+
+def weighted_rule(cells, sums, hood):
+    # 0.5 and 1 are exact in floating point, so this matches the per-cell weighted sum
+    weights = hood.weights if hood.weights is not None else hood.default_rule_weights()
+    return hood.sum(cells, weights) >= 2
+
+def random_flip_rule(cells, sums, hood):
+    return (sums >= 2) ^ rng.flip_mask(len(cells), 0.3)
+
+def zero_rule(cells, sums, hood):
+    return sums == 0
+
+def inverted_rule(cells, sums, hood):
+    return sums < 2
+
+def parity_rule(cells, sums, hood):
+    return sums % 2 == cells
+
+def mirror_rule(cells, sums, hood):
+    return hood.left_neighbor(cells)
+
+VECTORIZED_RULES = {
+    life.two_neighbors: two_neighbors,
+    life.three_neighbors: three_neighbors,
+    life.exactly_two_neighbors: exactly_two_neighbors,
+    life.exactly_three_neighbors: exactly_three_neighbors,
+    life.at_least_one_neighbor: at_least_one_neighbor,
+    life.at_most_one_neighbor: at_most_one_neighbor,
+    life.even_neighbors: even_neighbors,
+    life.odd_neighbors: odd_neighbors,
+    life.divisible_by_three: divisible_by_three,
+    life.majority_rule: majority_rule,
+    life.minority_rule: minority_rule,
+    life.always_dead_rule: always_dead_rule,
+    life.always_alive_rule: always_alive_rule,
+    life.copy_rule: copy_rule,
+    life.sum_plus_self_rule: sum_plus_self_rule,
+    life.double_threshold_rule: double_threshold_rule,
+    life.alternating_rule: alternating_rule,
+    life.weighted_rule: weighted_rule,
+    life.random_flip_rule: random_flip_rule,
+    life.zero_rule: zero_rule,
+    life.inverted_rule: inverted_rule,
+    life.parity_rule: parity_rule,
+    life.mirror_rule: mirror_rule,
+}
+
+def apply_rule(rule, row, neighborhood=DEFAULT_NEIGHBORHOOD):
+    """
+    Applies a life.py rule to the whole row at once and returns the new row as a uint8 array.
+    With the default neighborhood the result is identical to life.apply_rule(rule, row) cell
+    for cell; other neighborhoods change the radius, boundary and weights the rule sees.
+    """
+    if rule not in VECTORIZED_RULES:
+        raise ValueError(f"No vectorized version of rule {rule.__name__}")
+    cells = as_cells(row)
+    sums = neighborhood.sum(cells)
+    return VECTORIZED_RULES[rule](cells, sums, neighborhood).astype(np.uint8)
@@ -1,24 +1,52 @@
 import pygame
 import argparse
+import random
 import life
+import rng
 from config import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
-from game import Game
+from game import Game, Game2D
+from life2d import RULES_2D
 
 def main():
     parser = argparse.ArgumentParser(description="1D Game of Life with selectable rule")
     parser.add_argument("--rule", type=int, default=-1, help="Specify rule index to use (0-indexed)")
+    parser.add_argument("--engine", choices=life.ENGINE_NAMES, default="cell", help="Rule engine: per-cell Python, vectorized NumPy, bit-packed rows, lookup tables or memoized hashlife")
+    parser.add_argument("--fixed", action="store_true", help="Keep the selected rule instead of re-picking one every generation")
+    parser.add_argument("--detect-cycles", action="store_true", help="Detect fixed points/cycles of deterministic rules and fast-forward through them")
+    parser.add_argument("--spill", default=None, help="File to keep every generation that scrolls off screen (bit-packed)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the initial row, random rule picks and random flips")
+    parser.add_argument("--2d", dest="two_d", action="store_true", help="Run a 2D board (Moore neighborhood) instead of a 1D row; --rule then indexes the 2D rules")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="Print rule selections (-v) and the rule applied every step (-vv)")
     args = parser.parse_args()
     
-    if args.rule >= 0:
-        life._selected_rule = args.rule
-        print(f"Rule parameter provided: {args.rule}")
+    rules = RULES_2D if args.two_d else life.RULES
+    if args.rule >= len(rules):
+        parser.error(f"--rule must be between 0 and {len(rules) - 1}{' with --2d' if args.two_d else ''}")
+
+    if args.seed is not None:
+        random.seed(args.seed)
+        rng.seed(args.seed)
+
+    if not args.two_d:
+        life._verbosity = args.verbose
+        if args.rule >= 0:
+            life._selected_rule = args.rule
+            print(f"Rule parameter provided: {args.rule}")
+        life._engine = life.load_engine(args.engine)
+        if args.fixed:
+            life._full_random_mayhem = False
 
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("1D Game of Life")
+    pygame.display.set_caption("2D Game of Life" if args.two_d else "1D Game of Life")
     clock = pygame.time.Clock()
 
-    game = Game(screen)
+    if args.two_d:
+        rule = RULES_2D[args.rule] if args.rule >= 0 else RULES_2D[0]
+        print(f"2D rule: {rule.__name__}")
+        game = Game2D(screen, rule)
+    else:
+        game = Game(screen, detect_cycles=args.detect_cycles, spill_path=args.spill)
 
     running = True
     while running:
@@ -0,0 +1,82 @@
+import numpy as np
+
+BOUNDARIES = ["clip", "wrap"]
+
+class Neighborhood:
+    """
+    A 1D neighborhood: every offset from -radius to +radius except 0, an optional weight
+    per offset, and how the row ends are handled:
+      clip: cells outside the row are missing (count as dead), like the rules in life.py
+      wrap: the row is periodic, cell -1 is the last cell
+    The stencil is precomputed once; sums over a whole row are one padded copy plus one
+    slice per offset, so there are no bounds checks per cell and a wider radius only adds
+    array operations, not Python calls.
+    """
+    def __init__(self, radius=2, boundary="clip", weights=None):
+        if radius < 1:
+            raise ValueError("radius must be at least 1")
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Unknown boundary {boundary!r}, expected one of {BOUNDARIES}")
+        self.radius = radius
+        self.boundary = boundary
+        self.offsets = [o for o in range(-radius, radius + 1) if o != 0]
+        if weights is None:
+            self.weights = None
+        else:
+            weights = dict(weights)
+            self.weights = [weights.get(o, 0) for o in self.offsets]
+
+    def pad(self, cells):
+        """
+        Returns the row with `radius` cells added on both sides (dead or wrapped around).
+        """
+        if self.boundary == "wrap" and len(cells) > 0:
+            return np.pad(cells, self.radius, mode="wrap")
+        padded = np.zeros(len(cells) + 2 * self.radius, dtype=cells.dtype)
+        padded[self.radius:self.radius + len(cells)] = cells
+        return padded
+
+    def shifted(self, padded, n, offset):
+        # element i is cell i + offset
+        start = self.radius + offset
+        return padded[start:start + n]
+
+    def sum(self, cells, weights=None):
+        """
+        Sum of the neighbors of every cell, weighted by `weights` (one per offset)
+        or by the neighborhood's own weights; unweighted if neither is set.
+        """
+        weights = self.weights if weights is None else weights
+        padded = self.pad(cells)
+        n = len(cells)
+        if weights is None:
+            total = np.zeros(n, dtype=np.int32)
+            for offset in self.offsets:
+                total += self.shifted(padded, n, offset)
+            return total
+        total = np.zeros(n, dtype=np.float64)
+        for offset, weight in zip(self.offsets, weights):
+            if weight:
+                total += weight * self.shifted(padded, n, offset)
+        return total
+
+    def left_neighbor(self, cells):
+        """
+        The state of each cell's left neighbor; with clipped ends cell 0 keeps its own state.
+        """
+        padded = self.pad(cells)
+        left = self.shifted(padded, len(cells), -1).copy()
+        if self.boundary == "clip" and len(cells) > 0:
+            left[0] = cells[0]
+        return left
+
+    def default_rule_weights(self):
+        """
+        weighted_rule's weights for this radius: 1 for the direct neighbors, 0.5 further out.
+        """
+        return [1 if abs(o) == 1 else 0.5 for o in self.offsets]
+
+    def __repr__(self):
+        return f"Neighborhood(radius={self.radius}, boundary={self.boundary!r}, weights={self.weights})"
+
+DEFAULT_NEIGHBORHOOD = Neighborhood()
@@ -0,0 +1,51 @@
+import numpy as np
+import pygame
+
+class RowRenderer:
+    """
+    Keeps the space-time diagram on an off-screen surface. New generations scroll the
+    surface up and only the new rows are painted, each batch with a single surfarray blit
+    instead of one rect per cell.
+    """
+    def __init__(self, width, height, cell_size, alive_color, dead_color, background_color):
+        self.cell_size = cell_size
+        self.max_rows = height // cell_size
+        self.background_color = background_color
+        self.palette = np.array([dead_color, alive_color], dtype=np.uint8)
+        self.surface = pygame.Surface((width, height))
+        self.surface.fill(background_color)
+        self.visible_rows = 0
+
+    def rows_to_pixels(self, rows):
+        """
+        Turns a list of rows (lists, arrays or PackedRows) into a (width, height, 3) RGB array,
+        one pixel per cell, laid out the way pygame.surfarray expects.
+        """
+        cells = np.array([np.fromiter(row, dtype=np.uint8, count=len(row)) for row in rows])
+        return self.palette[cells].transpose(1, 0, 2)
+
+    def add_rows(self, rows, visible_rows):
+        """
+        Paints `rows` (the newest generations) at the bottom of the diagram.
+        `visible_rows` is how many history rows are on screen afterwards; older rows
+        that fell off the top are scrolled away.
+        """
+        if not rows:
+            return
+        rows = rows[-visible_rows:]
+        if len(rows) >= visible_rows:
+            self.surface.fill(self.background_color)
+        else:
+            dropped = self.visible_rows + len(rows) - visible_rows
+            if dropped > 0:
+                self.surface.scroll(0, -dropped * self.cell_size)
+        self.visible_rows = visible_rows
+
+        block = pygame.surfarray.make_surface(self.rows_to_pixels(rows))
+        block = pygame.transform.scale(block, (block.get_width() * self.cell_size, block.get_height() * self.cell_size))
+        top = (visible_rows - len(rows)) * self.cell_size
+        self.surface.fill(self.background_color, (0, top, self.surface.get_width(), len(rows) * self.cell_size))
+        self.surface.blit(block, (0, top))
+
+    def draw(self, screen, position=(0, 0)):
+        screen.blit(self.surface, position)
@@ -0,0 +1,84 @@
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Counter-based random numbers: every value is a hash of (seed, generation, cell index),
+# so a whole row (or any slice of it) can be drawn in one batched call and the result does
+# not depend on the order cells are visited in, or on which rules ran in earlier generations.
+# Serial, vectorized and parallel engines all agree.
+
+MASK64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+# row counter used for initial rows, so they never collide with rule draws
+INITIAL_ROW = MASK64
+
+_seed = None
+# generation the next flip masks are drawn for; life.step advances it once per generation
+_generation = 0
+
+def seed(value=None):
+    """
+    Sets the seed of the stream and restarts its generation counter. None picks a random seed.
+    """
+    global _seed, _generation
+    _seed = random.getrandbits(64) if value is None else value & MASK64
+    _generation = 0
+
+def next_generation(count=1):
+    """
+    Moves the flip masks on by `count` generations. life.step calls it after every generation;
+    code that applies rules to rows directly calls it once per generation it produces.
+    """
+    global _generation
+    _generation += count
+
+def _mix(x):
+    # splitmix64 finalizer
+    x = ((x ^ (x >> 30)) * MIX1) & MASK64
+    x = ((x ^ (x >> 27)) * MIX2) & MASK64
+    return x ^ (x >> 31)
+
+def _row_key(counter):
+    if _seed is None:
+        seed()
+    return _mix((_seed * GAMMA + counter) & MASK64)
+
+def uniforms(counter, n, start=0):
+    """
+    Returns n uniform floats in [0, 1) for cells start..start+n-1 of row `counter`, so a
+    chunked or parallel engine can draw just its slice of a row.
+    Uses NumPy when available; the pure-Python fallback gives the same values.
+    """
+    key = _row_key(counter)
+    if np is not None:
+        x = np.uint64(key) + (np.arange(start + 1, start + n + 1, dtype=np.uint64) * np.uint64(GAMMA))
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(MIX1)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(MIX2)
+        x = x ^ (x >> np.uint64(31))
+        return (x >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    return [(_mix((key + (i + 1) * GAMMA) & MASK64) >> 11) * (1.0 / (1 << 53)) for i in range(start, start + n)]
+
+def flip_mask(n, probability, start=0, generation=None):
+    """
+    Returns, for cells start..start+n-1, whether they flip (uniform < probability) in
+    `generation` (default: the current one, see next_generation). Drawing does not advance
+    the stream, so every rule and engine sees the same mask within a generation.
+    """
+    draws = uniforms(_generation if generation is None else generation, n, start)
+    if np is not None:
+        return draws < probability
+    return [u < probability for u in draws]
+
+def random_row(n):
+    """
+    A random 0/1 row of n cells (each alive with probability 0.5), keyed only by the seed.
+    """
+    draws = uniforms(INITIAL_ROW, n)
+    if np is not None:
+        return (draws < 0.5).astype(np.uint8)
+    return [1 if u < 0.5 else 0 for u in draws]
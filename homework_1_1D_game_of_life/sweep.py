@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import random
+import time
+import numpy as np
+import life
+import rng
+from config import ROW_CELLS
+
+def block_entropy(cells, block=3):
+    """
+    Shannon entropy (in bits) of the distribution of `block`-cell patterns in a row.
+    """
+    n = len(cells) - block + 1
+    if n <= 0:
+        return 0.0
+    codes = np.zeros(n, dtype=np.int64)
+    for k in range(block):
+        codes |= cells[k:k + n].astype(np.int64) << k
+    counts = np.bincount(codes, minlength=1 << block)
+    p = counts[counts > 0] / n
+    return float(-(p * np.log2(p)).sum())
+
+def run_one(task):
+    """
+    Runs a single (rule index, seed) pair for `generations` steps and collects its statistics:
+    density and block entropy per generation, plus the transient length and period of the first
+    repeated row (both -1 when no row repeats within the run).
+    """
+    rule_index, seed, width, generations, engine = task
+    rule = life.RULES[rule_index]
+    apply = life.load_engine(engine)
+    random.seed(seed)
+    rng.seed(seed)
+    row = np.asarray(rng.random_row(width), dtype=np.uint8)
+
+    density = np.empty(generations + 1, dtype=np.float32)
+    entropy = np.empty(generations + 1, dtype=np.float32)
+    seen = {}
+    transient = period = -1
+    start = time.perf_counter()
+    for generation in range(generations + 1):
+        if generation > 0:
+            row = np.asarray(apply(rule, row), dtype=np.uint8)
+            rng.next_generation()
+        density[generation] = row.mean() if width else 0.0
+        entropy[generation] = block_entropy(row)
+        if period < 0:
+            key = hash(row.tobytes())
+            if key in seen:
+                transient = seen[key]
+                period = generation - seen[key]
+            else:
+                seen[key] = generation
+    elapsed = time.perf_counter() - start
+    return {
+        "rule_index": rule_index,
+        "rule_name": rule.__name__,
+        "seed": seed,
+        "transient": transient,
+        "period": period,
+        "final_density": float(density[-1]),
+        "final_entropy": float(entropy[-1]),
+        "seconds": elapsed,
+        "density": density,
+        "entropy": entropy,
+    }
+
+def sweep(rule_indices, seeds, width, generations, engine="table", workers=None):
+    """
+    Runs every rule x seed combination over a process pool.
+    Returns the per-run results sorted by (rule_index, seed).
+    """
+    tasks = [(r, s, width, generations, engine) for r in rule_indices for s in seeds]
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = list(pool.imap_unordered(run_one, tasks))
+    results.sort(key=lambda r: (r["rule_index"], r["seed"]))
+    return results
+
+def to_columns(results):
+    """
+    Turns a list of per-run result dicts into one NumPy array per column.
+    Per-generation series become 2D arrays (runs x generations + 1).
+    """
+    columns = {}
+    for key in results[0]:
+        values = [r[key] for r in results]
+        if isinstance(values[0], np.ndarray):
+            columns[key] = np.stack(values)
+        else:
+            columns[key] = np.array(values)
+    return columns
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep all 1D life rules over many seeds in parallel")
+    parser.add_argument("--rules", type=int, nargs="*", default=None, help="Rule indices to sweep (default: all)")
+    parser.add_argument("--seeds", type=int, default=10, help="Number of random seeds per rule (default: 10)")
+    parser.add_argument("--first-seed", type=int, default=0, help="First seed, the rest follow consecutively (default: 0)")
+    parser.add_argument("--width", type=int, default=ROW_CELLS, help=f"Number of cells in a row (default: {ROW_CELLS})")
+    parser.add_argument("--generations", type=int, default=200, help="Generations per run (default: 200)")
+    parser.add_argument("--engine", choices=["numpy", "table"], default="table", help="Rule engine (default: table)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default="sweep_results.npz", help="Columnar .npz result file (default: sweep_results.npz)")
+    args = parser.parse_args()
+
+    for rule_index in args.rules or []:
+        if not 0 <= rule_index < len(life.RULES):
+            parser.error(f"--rules indices must be between 0 and {len(life.RULES) - 1}, got {rule_index}")
+    rule_indices = args.rules if args.rules else list(range(len(life.RULES)))
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+
+    start = time.perf_counter()
+    results = sweep(rule_indices, seeds, args.width, args.generations, args.engine, args.workers)
+    elapsed = time.perf_counter() - start
+    np.savez_compressed(args.output, **to_columns(results))
+
+    print(f"{'rule':<24}{'density':>9}{'entropy':>9}{'cycles':>8}{'period':>8}")
+    for rule_index in rule_indices:
+        runs = [r for r in results if r["rule_index"] == rule_index]
+        periods = [r["period"] for r in runs if r["period"] > 0]
+        print(f"{runs[0]['rule_name']:<24}"
+              f"{np.mean([r['final_density'] for r in runs]):>9.3f}"
+              f"{np.mean([r['final_entropy'] for r in runs]):>9.3f}"
+              f"{len(periods):>5}/{len(runs):<2}"
+              f"{(min(periods) if periods else '-'):>8}")
+    print(f"{len(results)} runs in {elapsed:.2f} seconds, results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import multiprocessing
+import time
+import numpy as np
+import schelling
+from model import SchellingModel
+from convergence import ConvergenceMonitor, NO_MOVES
+
+def run_one(task):
+    """
+    Runs one (threshold, density, size, seed) combination headless until no agent is unsatisfied,
+    the satisfaction plateaus (see ConvergenceMonitor) or `max_steps` steps have run.
+    steps_to_convergence is -1 unless every agent ended up satisfied; stop_reason says why
+    the run ended ("no moves", "plateau" or "max steps").
+    """
+    threshold, density, size, seed, max_steps, types, window, tolerance = task
+    start = time.perf_counter()
+    model = SchellingModel(size, size, threshold, density, types, seed=seed)
+    initial_index = model.segregation_index()
+    monitor = ConvergenceMonitor(window, tolerance)
+    steps = model.run(max_steps, monitor)
+    converged = model.converged()
+    stop_reason = NO_MOVES if converged else (monitor.reason or "max steps")
+    return {
+        "threshold": threshold,
+        "density": density,
+        "size": size,
+        "types": types,
+        "seed": seed,
+        "steps": steps,
+        "steps_to_convergence": steps if converged else -1,
+        "stop_reason": stop_reason,
+        "final_satisfaction": model.satisfaction(),
+        "initial_segregation": initial_index,
+        "final_segregation": model.segregation_index(),
+        "seconds": time.perf_counter() - start,
+    }
+
+def sweep(thresholds, densities, sizes, seeds, max_steps=500, workers=None, types=2, window=50, tolerance=1e-4):
+    """
+    Runs every threshold x density x size x seed combination over a process pool.
+    Returns the per-run results sorted by (threshold, density, size, seed).
+    """
+    tasks = [(t, d, n, s, max_steps, types, window, tolerance) for t in thresholds for d in densities for n in sizes for s in seeds]
+    # biggest grids first so they do not end up alone at the tail of the pool
+    tasks.sort(key=lambda task: -task[2])
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = list(pool.imap_unordered(run_one, tasks))
+    results.sort(key=lambda r: (r["threshold"], r["density"], r["size"], r["seed"]))
+    return results
+
+def to_columns(results):
+    """
+    Turns a list of per-run result dicts into one NumPy array per column.
+    """
+    return {key: np.array([r[key] for r in results]) for key in results[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Schelling sweep over threshold, density and grid size")
+    parser.add_argument("--thresholds", type=float, nargs="*", default=[0.3, 0.4, 0.5, 0.6, 0.7], help="Satisfaction thresholds (default: 0.3 0.4 0.5 0.6 0.7)")
+    parser.add_argument("--densities", type=float, nargs="*", default=[0.7, 0.8, 0.9], help="Fractions of occupied cells (default: 0.7 0.8 0.9)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[50], help="Grid sizes, each grid is size x size (default: 50)")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of random seeds per combination (default: 5)")
+    parser.add_argument("--first-seed", type=int, default=0, help="First seed, the rest follow consecutively (default: 0)")
+    parser.add_argument("--max-steps", type=int, default=500, help="Steps before a run counts as not converged (default: 500)")
+    parser.add_argument("--types", type=int, default=2, help="Number of agent types, all sharing the swept threshold (default: 2)")
+    parser.add_argument("--plateau-window", type=int, default=50, help="Stop a run once satisfaction stays within the tolerance for this many steps, 0 to disable (default: 50)")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Satisfaction change that still counts as a plateau (default: 0.0001)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default="schelling_sweep.npz", help="Columnar .npz result file (default: schelling_sweep.npz)")
+    args = parser.parse_args()
+
+    if not 1 <= args.types <= schelling.MAX_TYPES:
+        parser.error(f"--types must be between 1 and {schelling.MAX_TYPES}")
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    start = time.perf_counter()
+    results = sweep(args.thresholds, args.densities, args.sizes, seeds, args.max_steps, args.workers, args.types, args.plateau_window, args.tolerance)
+    elapsed = time.perf_counter() - start
+    np.savez_compressed(args.output, **to_columns(results))
+
+    print(f"{'threshold':>9}{'density':>9}{'size':>7}{'converged':>11}{'steps':>8}{'segregation':>13}")
+    for t in args.thresholds:
+        for d in args.densities:
+            for n in args.sizes:
+                runs = [r for r in results if (r["threshold"], r["density"], r["size"]) == (t, d, n)]
+                steps = [r["steps_to_convergence"] for r in runs if r["steps_to_convergence"] >= 0]
+                print(f"{t:>9.2f}{d:>9.2f}{n:>7}"
+                      f"{len(steps):>8}/{len(runs):<2}"
+                      f"{(f'{np.mean(steps):.1f}' if steps else '-'):>8}"
+                      f"{np.mean([r['final_segregation'] for r in runs]):>13.3f}")
+    print(f"{len(results)} runs in {elapsed:.2f} seconds, results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
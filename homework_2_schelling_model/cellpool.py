@@ -0,0 +1,49 @@
+import random
+
+class CellPool:
+    """
+    A set of grid cells with O(1) add, remove and uniform random pick.
+    Cells live in a list and a dict maps each cell to its list index; removing a cell
+    moves the last cell into its slot, so nothing is ever shifted or searched.
+    """
+    def __init__(self, cells=()):
+        self.index = dict.fromkeys(cells)
+        self.cells = list(self.index)
+        for position, cell in enumerate(self.cells):
+            self.index[cell] = position
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        position = self.index.pop(cell)
+        last = self.cells.pop()
+        if position < len(self.cells):
+            self.cells[position] = last
+            self.index[last] = position
+
+    def discard(self, cell):
+        if cell in self.index:
+            self.remove(cell)
+
+    def choice(self, rng=random):
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def pop_random(self, rng=random):
+        """
+        Removes and returns a uniformly chosen cell.
+        """
+        cell = self.choice(rng)
+        self.remove(cell)
+        return cell
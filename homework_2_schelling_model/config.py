@@ -14,6 +14,8 @@ GRID_ORIGIN_Y = (WINDOW_HEIGHT - BOTTOM_BAR_HEIGHT - GRID_HEIGHT)
 COLOR_EMPTY = (200, 200, 200) 
 COLOR_TYPE1 = (0, 0, 255)
 COLOR_TYPE2 = (255, 0, 0) 
+# agent type t is drawn with TYPE_COLORS[t - 1]
+TYPE_COLORS = [COLOR_TYPE1, COLOR_TYPE2, (0, 160, 0), (230, 160, 0), (140, 0, 170), (0, 170, 170), (120, 80, 40), (255, 105, 180)]
 COLOR_GRID_LINE = (150, 150, 150)
 
 GRAPH_AREA_X = GRID_ORIGIN_X + GRID_WIDTH + 20
@@ -21,5 +23,8 @@ GRAPH_AREA_Y = GRID_ORIGIN_Y
 GRAPH_AREA_WIDTH = WINDOW_WIDTH - GRAPH_AREA_X - 20
 GRAPH_AREA_HEIGHT = GRID_HEIGHT
 
+# the satisfaction graph keeps at most this many min/max buckets, however long the run
+EVOLUTION_BUCKETS = 256
+
 FPS = 300
 AUTO_FPS = 1
@@ -0,0 +1,50 @@
+NO_MOVES = "no moves"
+PLATEAU = "plateau"
+
+class ConvergenceMonitor:
+    """
+    Watches a run step by step and decides when it has settled:
+      no moves: no agent moved in the last step (or none is left unsatisfied), so the grid
+                can never change again
+      plateau:  the satisfaction ratio has not improved by more than `tolerance` on its best
+                value for `window` steps, whether it is flat or just fluctuating
+                (set window to 0 to only stop when nothing moves)
+    The first time either happens, `converged`, `reason` and `step` are set and
+    `on_converged(step, reason, satisfaction)` is called, if given. The state stays
+    converged until reset().
+    """
+    def __init__(self, window=20, tolerance=1e-3, on_converged=None):
+        self.window = window
+        self.tolerance = tolerance
+        self.on_converged = on_converged
+        self.reset()
+
+    def reset(self):
+        self.best = None
+        self.best_step = None
+        self.converged = False
+        self.reason = None
+        self.step = None
+
+    def observe(self, step, moves, satisfaction):
+        """
+        Records one step (its number, how many agents moved and the satisfaction after it).
+        Returns True once the run has converged.
+        """
+        if self.converged:
+            return True
+        if self.best is None or satisfaction > self.best + self.tolerance:
+            self.best = satisfaction
+            self.best_step = step
+        if moves == 0 or satisfaction >= 1.0:
+            reason = NO_MOVES
+        elif self.window and step - self.best_step >= self.window:
+            reason = PLATEAU
+        else:
+            return False
+        self.converged = True
+        self.reason = reason
+        self.step = step
+        if self.on_converged is not None:
+            self.on_converged(step, reason, satisfaction)
+        return True
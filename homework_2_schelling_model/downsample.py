@@ -0,0 +1,60 @@
+class MinMaxBuffer:
+    """
+    Fixed-memory summary of a growing series for plotting. Values are grouped into at most
+    `capacity` buckets of `bucket_size` consecutive steps; each bucket keeps only its minimum
+    and maximum (with the steps they occurred at). When the buckets run out, neighbors are
+    merged pairwise and the bucket size doubles, so peaks and dips survive no matter how
+    long the series gets, and memory and drawing cost stay constant.
+    """
+    def __init__(self, capacity=256):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.bucket_size = 1
+        # each bucket is [min_step, min_value, max_step, max_value]
+        self.buckets = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        step = self.count
+        self.count += 1
+        if self.buckets and step // self.bucket_size == (step - 1) // self.bucket_size:
+            bucket = self.buckets[-1]
+            if value < bucket[1]:
+                bucket[0], bucket[1] = step, value
+            if value > bucket[3]:
+                bucket[2], bucket[3] = step, value
+            return
+        self.buckets.append([step, value, step, value])
+        if len(self.buckets) > self.capacity:
+            self._merge()
+
+    def _merge(self):
+        merged = []
+        for k in range(0, len(self.buckets), 2):
+            pair = self.buckets[k:k + 2]
+            low = min(pair, key=lambda b: b[1])
+            high = max(pair, key=lambda b: b[3])
+            merged.append([low[0], low[1], high[2], high[3]])
+        self.buckets = merged
+        self.bucket_size *= 2
+
+    def points(self):
+        """
+        Returns (step, value) pairs in step order: each bucket's minimum and maximum
+        (once if they are the same point). At most 2 * capacity points.
+        """
+        result = []
+        for min_step, min_value, max_step, max_value in self.buckets:
+            if min_step == max_step:
+                result.append((min_step, min_value))
+            elif min_step < max_step:
+                result.append((min_step, min_value))
+                result.append((max_step, max_value))
+            else:
+                result.append((max_step, max_value))
+                result.append((min_step, min_value))
+        return result
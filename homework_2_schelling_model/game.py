@@ -1,65 +1,81 @@
 import pygame
 import random
-from config import AUTO_FPS, WINDOW_WIDTH, WINDOW_HEIGHT, BOTTOM_BAR_HEIGHT, GRAPH_AREA_X, GRAPH_AREA_Y, GRAPH_AREA_WIDTH, GRAPH_AREA_HEIGHT, GRID_ROWS, GRID_COLS
+from config import AUTO_FPS, EVOLUTION_BUCKETS, WINDOW_WIDTH, WINDOW_HEIGHT, BOTTOM_BAR_HEIGHT, GRAPH_AREA_X, GRAPH_AREA_Y, GRAPH_AREA_WIDTH, GRAPH_AREA_HEIGHT, GRID_ROWS, GRID_COLS, CELL_SIZE, GRID_ORIGIN_X, GRID_ORIGIN_Y, COLOR_EMPTY, TYPE_COLORS, COLOR_GRID_LINE
 from button import ButtonManager
-import schelling
+from renderer import GridRenderer
+from model import SchellingModel
+from convergence import ConvergenceMonitor
+from metrics import MetricsWriter
+from downsample import MinMaxBuffer
 
 class Game:
-    def __init__(self, screen, threshold):
+    def __init__(self, screen, threshold, density=0.9, types=2, metrics_path=None, cluster_every=0):
         self.number_of_iterations = 0
-        self.fully_satisfied = False
         self.screen = screen
         self.threshold = threshold
-        self.rep = schelling.initialize_representation(density=0.9)
-        self.total_agents = sum(1 for i in range(GRID_ROWS) for j in range(GRID_COLS) if self.rep[i][j] != 0)
-        self.evolution = []
+        self.model = SchellingModel(GRID_ROWS, GRID_COLS, threshold, density, types, seed=random.getrandbits(64))
+        self.rep = self.model.grid
+        self.total_agents = self.model.agents
+        self.evolution = MinMaxBuffer(EVOLUTION_BUCKETS)
+        self.monitor = ConvergenceMonitor(on_converged=self.on_converged)
+        self.metrics = MetricsWriter(metrics_path) if metrics_path else None
+        # cluster columns are recorded every `cluster_every` steps (never with 0), they need a full labeling pass
+        self.cluster_every = cluster_every
+        if self.metrics is not None:
+            self.metrics.record(self.model.metrics(clusters=cluster_every > 0))
         self.button_manager = ButtonManager(WINDOW_WIDTH, WINDOW_HEIGHT, BOTTOM_BAR_HEIGHT)
         self.button_manager.set_callback("1 Step", self.one_step)
         self.button_manager.set_callback("10 Steps", self.ten_steps)
         self.button_manager.set_callback("AUTO", self.toggle_auto)
         self.auto_mode = False
         self.frame_count = 0
+        self.renderer = GridRenderer(GRID_ROWS, GRID_COLS, CELL_SIZE, [COLOR_EMPTY] + TYPE_COLORS, COLOR_EMPTY, COLOR_GRID_LINE)
+        # set whenever the screen has to be redrawn (new step, hover changes, ...)
+        self.dirty = True
 
     def compute_satisfaction_ratio(self):
-        satisfied = 0
-        occupied = 0
-        for i in range(GRID_ROWS):
-            for j in range(GRID_COLS):
-                if self.rep[i][j] != 0:
-                    occupied += 1
-                    if schelling.is_satisfied(self.rep, i, j, threshold=self.threshold):
-                        satisfied += 1
-        satisfaction = satisfied / occupied if occupied > 0 else 1.0
-        if satisfaction == 1.0:
-            self.fully_satisfied = True
-            print(f"Fully satisfied at {self.number_of_iterations} iterations.")
-        return satisfaction
+        return self.model.satisfaction()
 
-    def one_step(self):
+    def on_converged(self, step, reason, satisfaction):
+        self.auto_mode = False
+        print(f"Converged ({reason}) at {step} iterations, satisfaction {satisfaction:.3f}.")
+
+    def advance(self):
         self.number_of_iterations += 1
-        self.rep = schelling.step(self.rep, threshold=self.threshold)
+        moves = self.model.step()
         ratio = self.compute_satisfaction_ratio()
         self.evolution.append(ratio)
-        if self.fully_satisfied:
-            self.auto_mode = False
+        self.dirty = True
+        self.monitor.observe(self.number_of_iterations, moves, ratio)
+        if self.metrics is not None:
+            clusters = self.cluster_every > 0 and self.number_of_iterations % self.cluster_every == 0
+            self.metrics.record(self.model.metrics(clusters))
+
+    def one_step(self):
+        self.advance()
         print(f"Step executed. Step number: {self.number_of_iterations}")
 
     def ten_steps(self):
         for _ in range(10):
-            self.number_of_iterations += 1
-            self.rep = schelling.step(self.rep, threshold=self.threshold)
-            ratio = self.compute_satisfaction_ratio()
-            self.evolution.append(ratio)
+            if self.monitor.converged:
+                break
+            self.advance()
         print(f"10 steps executed. Step number: {self.number_of_iterations}")
 
     def toggle_auto(self):
+        if self.monitor.converged and not self.auto_mode:
+            print(f"Already converged ({self.monitor.reason}), auto mode stays off")
+            return
         self.auto_mode = not self.auto_mode
         print("Auto mode", "enabled" if self.auto_mode else "disabled")
 
     def handle_events(self, events):
         for event in events:
             self.button_manager.handle_event(event)
+            self.dirty = True
             if event.type == pygame.QUIT:
+                if self.metrics is not None:
+                    self.metrics.close()
                 pygame.quit()
                 exit()
 
@@ -69,11 +85,21 @@ class Game:
             self.one_step()
 
     def draw(self):
+        """
+        Redraws the screen if anything changed since the last frame and returns whether it did,
+        so the caller only flips the display when needed. Only moved cells are repainted.
+        """
+        changed = self.model.tracker.pop_changed()
+        if changed is not None and not (changed or self.dirty):
+            return False
+        self.renderer.update(self.rep, changed)
         self.screen.fill((255, 255, 255))
-        schelling.plot(self.rep, self.screen)
+        self.renderer.draw(self.screen, (GRID_ORIGIN_X, GRID_ORIGIN_Y))
         pygame.draw.rect(self.screen, (50, 50, 50), (0, WINDOW_HEIGHT - BOTTOM_BAR_HEIGHT, WINDOW_WIDTH, BOTTOM_BAR_HEIGHT))
         self.button_manager.draw(self.screen)
         self.draw_graph()
+        self.dirty = False
+        return True
 
     def draw_graph(self):
         graph_rect = pygame.Rect(GRAPH_AREA_X, GRAPH_AREA_Y, GRAPH_AREA_WIDTH, GRAPH_AREA_HEIGHT)
@@ -83,7 +109,7 @@ class Game:
         max_steps = len(self.evolution)
         x_scale = GRAPH_AREA_WIDTH / (max_steps - 1)
         points = []
-        for i, ratio in enumerate(self.evolution):
+        for i, ratio in self.evolution.points():
             x = GRAPH_AREA_X + i * x_scale
             y = GRAPH_AREA_Y + GRAPH_AREA_HEIGHT - (ratio * GRAPH_AREA_HEIGHT)
             points.append((x, y))
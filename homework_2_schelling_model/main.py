@@ -1,6 +1,7 @@
 import argparse
+import random
 import pygame
-from config import WINDOW_WIDTH, WINDOW_HEIGHT, FPS
+from config import WINDOW_WIDTH, WINDOW_HEIGHT, FPS, TYPE_COLORS
 from game import Game
 
 def main():
@@ -8,25 +9,41 @@ def main():
     parser.add_argument(
         "--threshold", 
         type=float, 
-        default=0.5,
-        help="Satisfaction threshold for agents (e.g. 0.3 for 30%%, default is 0.5)"
+        nargs="+",
+        default=[0.5],
+        help="Satisfaction threshold for agents (e.g. 0.3 for 30%%, default is 0.5), or one per agent type"
     )
+    parser.add_argument("--types", type=int, default=2, help="Number of agent types (default is 2)")
+    parser.add_argument("--density", type=float, default=0.9, help="Fraction of occupied cells (default is 0.9)")
+    parser.add_argument("--metrics", default=None, help="Directory to stream per-step segregation metrics to")
+    parser.add_argument("--cluster-every", type=int, default=0, help="Also record cluster metrics every N steps (default is 0, never)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the initial grid and the moves")
     args = parser.parse_args()
 
+    if not 1 <= args.types <= len(TYPE_COLORS):
+        parser.error(f"--types must be between 1 and {len(TYPE_COLORS)} (one color per type)")
+    if len(args.threshold) not in (1, args.types):
+        parser.error(f"--threshold takes one value or one per type ({args.types}), got {len(args.threshold)}")
+    if args.cluster_every < 0:
+        parser.error("--cluster-every must be 0 or more")
+    threshold = args.threshold[0] if len(args.threshold) == 1 else args.threshold
+    if args.seed is not None:
+        random.seed(args.seed)
+
     pygame.init()
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Schelling's Model Simulation")
     clock = pygame.time.Clock()
 
-    game = Game(screen, threshold=args.threshold)
+    game = Game(screen, threshold=threshold, density=args.density, types=args.types, metrics_path=args.metrics, cluster_every=args.cluster_every)
 
     running = True
     while running:
         events = pygame.event.get()
         game.handle_events(events)
         game.update()
-        game.draw()
-        pygame.display.flip()
+        if game.draw():
+            pygame.display.flip()
         clock.tick(FPS)
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+import json
+import os
+import numpy as np
+import schelling
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+COLUMNS = ["step", "satisfaction", "segregation_index", "like_fraction", "interface_length",
+           "clusters", "largest_cluster", "mean_cluster_size"]
+
+def _pairs(grid):
+    # (a, b) views of every horizontally and vertically adjacent pair of cells
+    return [(grid[:, :-1], grid[:, 1:]), (grid[:-1, :], grid[1:, :])]
+
+def interface_length(grid):
+    """
+    Number of edges between orthogonally adjacent agents of different types.
+    """
+    return int(sum(np.count_nonzero((a != 0) & (b != 0) & (a != b)) for a, b in _pairs(grid)))
+
+def _find_roots(parent):
+    # pointer jumping until every cell points at its root
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent = grandparent
+
+def cluster_labels(grid):
+    """
+    Labels the clusters: orthogonally connected agents of the same type. Returns an int array
+    shaped like the grid, 0 for empty cells and a positive label per cluster, and the number of
+    clusters. Uses scipy.ndimage.label when SciPy is installed, otherwise a vectorized
+    union-find: every same-type edge hooks the larger root onto the smaller one, then pointer
+    jumping flattens the trees, repeated until no edge joins two different roots.
+    """
+    if ndimage is not None:
+        labels = np.zeros(grid.shape, dtype=np.int64)
+        count = 0
+        for t in np.unique(grid[grid != 0]):
+            type_labels, n = ndimage.label(grid == t)
+            labels[type_labels > 0] = type_labels[type_labels > 0] + count
+            count += n
+        return labels, count
+
+    rows, cols = grid.shape
+    index = np.arange(rows * cols).reshape(rows, cols)
+    edges = [(ia[same], ib[same]) for (a, b), (ia, ib) in zip(_pairs(grid), _pairs(index))
+             for same in [(a != 0) & (a == b)]]
+    first = np.concatenate([e[0] for e in edges])
+    second = np.concatenate([e[1] for e in edges])
+    parent = np.arange(rows * cols)
+    while True:
+        parent = _find_roots(parent)
+        ra, rb = parent[first], parent[second]
+        split = ra != rb
+        if not split.any():
+            break
+        ra, rb = ra[split], rb[split]
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+        first, second = first[split], second[split]
+    flat = grid.reshape(-1) != 0
+    roots, labels = np.unique(parent[flat], return_inverse=True)
+    result = np.zeros(rows * cols, dtype=np.int64)
+    result[flat] = labels + 1
+    return result.reshape(rows, cols), len(roots)
+
+def cluster_metrics(grid):
+    """
+    The cluster columns of COLUMNS: number of clusters, largest and mean cluster size.
+    This is the expensive part of the metrics (a labeling pass over the whole grid).
+    """
+    labels, count = cluster_labels(grid)
+    sizes = np.bincount(labels.reshape(-1))[1:]
+    return {
+        "clusters": count,
+        "largest_cluster": int(sizes.max()) if count else 0,
+        "mean_cluster_size": float(sizes.mean()) if count else 0.0,
+    }
+
+def compute(grid, like=None, total=None, clusters=True):
+    """
+    Segregation metrics of a grid as a dict (see COLUMNS, without step and satisfaction).
+    Pass a tracker's like/total counts to skip recounting neighbors. With clusters=False the
+    cluster columns are NaN, which saves the labeling pass on big grids.
+    """
+    if like is None or total is None:
+        like, total = schelling.neighbor_counts(grid)
+    agents = (grid != 0) & (total > 0)
+    like_fraction = float((like[agents] / total[agents]).mean()) if agents.any() else 1.0
+    result = {
+        "segregation_index": schelling.segregation_index(grid, like, total),
+        "like_fraction": like_fraction,
+        "interface_length": interface_length(grid),
+        "clusters": np.nan,
+        "largest_cluster": np.nan,
+        "mean_cluster_size": np.nan,
+    }
+    if clusters:
+        result.update(cluster_metrics(grid))
+    return result
+
+class MetricsWriter:
+    """
+    Append-only columnar metrics store: a directory with one raw float64 file per column
+    and a columns.json listing them. Every record() appends one value to each column file,
+    so nothing is kept in memory and a run of any length can be read back (even while it is
+    still being written) with read_metrics(). Each writer starts a new run: the column files
+    of an earlier run in the same directory are truncated rather than appended to.
+    """
+    def __init__(self, path, columns=COLUMNS):
+        self.path = path
+        self.columns = list(columns)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "columns.json"), "w") as f:
+            json.dump(self.columns, f)
+        self.files = {name: open(os.path.join(path, f"{name}.f8"), "wb") for name in self.columns}
+
+    def record(self, row):
+        # flushed right away so the row survives a crash and read_metrics() sees it immediately
+        for name in self.columns:
+            f = self.files[name]
+            f.write(np.float64(row.get(name, np.nan)).tobytes())
+            f.flush()
+
+    def flush(self):
+        for f in self.files.values():
+            f.flush()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+def read_metrics(path):
+    """
+    Returns {column: float64 array} for a directory written by MetricsWriter,
+    memory-mapped so only the parts that are used get read.
+    """
+    with open(os.path.join(path, "columns.json")) as f:
+        columns = json.load(f)
+    result = {}
+    for name in columns:
+        file = os.path.join(path, f"{name}.f8")
+        size = os.path.getsize(file) // 8
+        result[name] = np.memmap(file, dtype=np.float64, mode="r", shape=(size,)) if size else np.zeros(0)
+    return result
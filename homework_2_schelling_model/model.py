@@ -0,0 +1,122 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+import parallel
+import schelling
+from satisfaction import SatisfactionTracker
+
+class SchellingModel:
+    """
+    One Schelling simulation with everything it needs: its own grid size, threshold (shared or
+    one per type), number of agent types and random generator, the grid as an int8 array and a SatisfactionTracker with
+    int16 neighbor counts. Nothing is read from config.py or kept in module globals, so any
+    number of models of any size can live in one process, and models in different threads
+    never share state.
+    """
+    def __init__(self, rows, cols, threshold=0.5, density=0.9, types=2, seed=None):
+        self.rows = rows
+        self.cols = cols
+        self.threshold = threshold
+        self.density = density
+        self.types = types
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.grid = schelling.initialize_representation(density, rows, cols, types, self.rng)
+        self._tracker = SatisfactionTracker(self.grid, threshold, types)
+        # set by step_parallel, which changes the grid behind the tracker's back
+        self._stale = False
+        self.thresholds = self._tracker.thresholds
+        self.steps = 0
+
+    @property
+    def tracker(self):
+        """
+        The SatisfactionTracker of the grid, recounted on first use after parallel steps.
+        """
+        if self._stale:
+            self._tracker.rebuild()
+            self._stale = False
+        return self._tracker
+
+    @property
+    def agents(self):
+        return self._tracker.occupied
+
+    def satisfaction(self):
+        return self.tracker.ratio()
+
+    def converged(self):
+        return not self.tracker.unsatisfied
+
+    def step(self):
+        """
+        Moves every currently unsatisfied agent once and returns the number of moves.
+        """
+        moves = len(self.tracker.unsatisfied) if self.tracker.empty else 0
+        schelling.step(self.grid, self.threshold, self.tracker, self.rng)
+        self.steps += 1
+        return moves
+
+    def step_parallel(self, pool=None, tile_size=parallel.DEFAULT_TILE_SIZE, equivalent=False):
+        """
+        One step through parallel.step, scanning tiles on `pool` (a multiprocessing.Pool).
+        Meant for very large grids: the tracker is not updated, only marked stale, so a run of
+        parallel steps never pays for it. The next use of the tracker (satisfaction(), step(),
+        metrics(), ...) recounts it with one vectorized pass and reports every cell as changed.
+        Returns the number of moves.
+        """
+        seed = self.rng.getrandbits(63)
+        sources, targets = parallel.step(self.grid, self.threshold, seed, self.steps, tile_size, pool, equivalent, self.rng)
+        self._stale = True
+        self.steps += 1
+        return len(sources)
+
+    def run(self, max_steps, monitor=None):
+        """
+        Steps until no agent is unsatisfied or `max_steps` steps have run, or, with a
+        ConvergenceMonitor, until the monitor reports convergence (which includes a plateau).
+        Returns the number of steps taken.
+        """
+        start = self.steps
+        while not self.converged() and self.steps - start < max_steps:
+            moves = self.step()
+            if monitor is not None and monitor.observe(self.steps, moves, self.satisfaction()):
+                break
+        return self.steps - start
+
+    def segregation_index(self):
+        return self.tracker.segregation_index()
+
+    def metrics(self, clusters=False):
+        """
+        The current step's metrics row (see metrics.COLUMNS). Everything but the cluster
+        columns comes from the tracker's running counts in O(1); the clusters need a labeling
+        pass over the whole grid, so they are only computed with clusters=True (NaN otherwise).
+        """
+        tracker = self.tracker
+        row = {
+            "step": self.steps,
+            "satisfaction": self.satisfaction(),
+            "segregation_index": tracker.segregation_index(),
+            "like_fraction": tracker.like_fraction(),
+            "interface_length": tracker.interface,
+            "clusters": float("nan"),
+            "largest_cluster": float("nan"),
+            "mean_cluster_size": float("nan"),
+        }
+        if clusters:
+            row.update(metrics.cluster_metrics(self.grid))
+        return row
+
+    def __repr__(self):
+        return (f"SchellingModel({self.rows}x{self.cols}, threshold={self.threshold}, "
+                f"density={self.density}, types={self.types}, step={self.steps})")
+
+def run_models(models, max_steps, workers=None):
+    """
+    Runs several independent models to convergence (or `max_steps`) on a thread pool and
+    returns the number of steps each took. The NumPy parts release the GIL; for CPU-bound
+    sweeps over many grids, batch.py's process pool scales further.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda model: model.run(max_steps), models))
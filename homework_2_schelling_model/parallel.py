@@ -0,0 +1,139 @@
+import random
+import numpy as np
+import schelling
+from cellpool import CellPool
+
+# Parallel steps for large grids. The grid is cut into tiles that worker processes scan for
+# unsatisfied agents and empty cells (each tile is sent with a one-cell halo, so satisfaction
+# at tile borders is exact). Moves are then made in one synchronous round: every unsatisfied
+# agent proposes an empty destination and conflicts are settled deterministically.
+#
+# Random draws are hashes of (seed, step, cell, round) rather than a stream, so the result
+# does not depend on how many tiles or workers there are, only on the seed.
+
+MASK64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+DEFAULT_TILE_SIZE = 512
+HIGH32 = 0xFFFFFFFF00000000
+
+def _mix(x):
+    # splitmix64 finalizer on a uint64 array
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(MIX1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(MIX2)
+    return x ^ (x >> np.uint64(31))
+
+def hashes(seed, step, cells, stream):
+    """
+    One 64-bit hash per cell, keyed by (seed, step, stream) and the cell's flat index.
+    """
+    with np.errstate(over="ignore"):
+        key = int(_mix(np.uint64(((seed * GAMMA) ^ (step << 20) ^ stream) & MASK64)))
+        return _mix(np.uint64(key) + (np.asarray(cells, dtype=np.uint64) + np.uint64(1)) * np.uint64(GAMMA))
+
+def uniforms(seed, step, cells, stream):
+    return (hashes(seed, step, cells, stream) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+def split_tiles(rows, cols, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Returns (r0, r1, c0, c1) bounds of square-ish tiles covering the grid.
+    """
+    return [(r0, min(r0 + tile_size, rows), c0, min(c0 + tile_size, cols))
+            for r0 in range(0, rows, tile_size) for c0 in range(0, cols, tile_size)]
+
+def scan_tile(task):
+    """
+    Worker: takes a tile with a one-cell halo and returns the flat grid indices of its
+    unsatisfied agents and of its empty cells.
+    """
+    block, r0, c0, threshold, cols = task
+    inner = block[1:-1, 1:-1]
+    satisfied = schelling.satisfied_mask(block, threshold)[1:-1, 1:-1]
+    def to_flat(local):
+        i, j = np.nonzero(local)
+        return (i + r0).astype(np.int64) * cols + (j + c0)
+    return to_flat(~satisfied), to_flat(inner == 0)
+
+def scan(rep, threshold=0.5, tile_size=DEFAULT_TILE_SIZE, pool=None):
+    """
+    Finds all unsatisfied agents and empty cells, one tile per task on `pool` (a
+    multiprocessing.Pool, or in this process when None). Returns two sorted flat index arrays.
+    Cells outside the grid are padded as empty, which is how neighbor_counts treats them.
+    """
+    rows, cols = rep.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.int8)
+    padded[1:-1, 1:-1] = rep
+    tasks = [(padded[r0:r1 + 2, c0:c1 + 2], r0, c0, threshold, cols) for r0, r1, c0, c1 in split_tiles(rows, cols, tile_size)]
+    results = pool.map(scan_tile, tasks) if pool is not None else [scan_tile(task) for task in tasks]
+    unsatisfied = np.sort(np.concatenate([r[0] for r in results]))
+    empty = np.sort(np.concatenate([r[1] for r in results]))
+    return unsatisfied, empty
+
+def reconcile(unsatisfied, empty, seed, step, rounds=4):
+    """
+    Assigns destinations without conflicts. In every round each waiting agent proposes a free
+    cell drawn from its hash; a cell proposed by several agents goes to the one with the lowest
+    priority and the others try again in the next round among the cells still free.
+    Agents left after `rounds` rounds stay where they are. Returns (sources, targets).
+    A priority is the high half of a hash with the agent's flat index in the low half, so no two
+    agents tie and each cell's winner is found with one scatter-min instead of a sort.
+    """
+    sources = []
+    targets = []
+    waiting = unsatisfied
+    free = empty
+    for r in range(rounds):
+        if len(waiting) == 0 or len(free) == 0:
+            break
+        pick = (uniforms(seed, step, waiting, 2 * r) * len(free)).astype(np.int64)
+        priority = (hashes(seed, step, waiting, 2 * r + 1) & np.uint64(HIGH32)) | waiting.astype(np.uint64)
+        best = np.full(len(free), np.iinfo(np.uint64).max, dtype=np.uint64)
+        np.minimum.at(best, pick, priority)
+        placed = best[pick] == priority
+        sources.append(waiting[placed])
+        targets.append(free[pick[placed]])
+        taken = np.zeros(len(free), dtype=bool)
+        taken[pick[placed]] = True
+        free = free[~taken]
+        waiting = waiting[~placed]
+    if not sources:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(sources), np.concatenate(targets)
+
+def step(rep, threshold=0.5, seed=0, step_number=0, tile_size=DEFAULT_TILE_SIZE, pool=None, equivalent=False, rng=random):
+    """
+    One parallel step of Schelling's model, in place. Returns (sources, targets) of the moves.
+
+    By default all moves happen at once: every agent that was unsatisfied at the start of the
+    step proposes a destination among the cells that were empty at the start, and reconcile()
+    settles conflicts. The result only depends on (seed, step_number). Unlike the serial
+    schelling.step, cells vacated during the step are not available until the next step and
+    an agent that loses every round stays put.
+
+    With equivalent=True only the scan is parallel; the moves are made one by one in random
+    order from `rng`, with vacated cells going back to the free pool, exactly like
+    schelling.step. Use it to check results against the serial dynamics (they agree in
+    distribution, not move for move).
+    """
+    unsatisfied, empty = scan(rep, threshold, tile_size, pool)
+    flat = rep.reshape(-1)
+    if equivalent:
+        order = unsatisfied.tolist()
+        rng.shuffle(order)
+        free = CellPool(empty.tolist())
+        sources = []
+        targets = []
+        for source in order:
+            if free:
+                target = free.pop_random(rng)
+                flat[target] = flat[source]
+                flat[source] = 0
+                free.add(source)
+                sources.append(source)
+                targets.append(target)
+        return np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
+    sources, targets = reconcile(unsatisfied, empty, seed, step_number)
+    flat[targets] = flat[sources]
+    flat[sources] = 0
+    return sources, targets
@@ -0,0 +1,67 @@
+import numpy as np
+import pygame
+
+class GridRenderer:
+    """
+    Keeps the drawn grid on an off-screen surface and only repaints what changed.
+    Grid lines are drawn once into their own layer. A full refresh is one surfarray blit of
+    the whole grid (one pixel per cell, scaled up) with the line layer on top; after a step
+    only the cells whose state changed are filled again, inside their grid lines. When
+    nothing changed, drawing is a single blit of the cached surface.
+    """
+    def __init__(self, rows, cols, cell_size, colors, empty_color, line_color):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        # one color per cell value; unknown agent types are drawn like empty cells
+        self.palette = np.tile(np.array(empty_color, dtype=np.uint8), (128, 1))
+        for value, color in enumerate(colors):
+            self.palette[value] = color
+        size = (cols * cell_size + 1, rows * cell_size + 1)
+        self.surface = pygame.Surface(size)
+        self.lines = self.draw_lines(size, line_color)
+        self.needs_refresh = True
+
+    def draw_lines(self, size, line_color):
+        key = (255, 0, 255) if tuple(line_color) != (255, 0, 255) else (0, 255, 0)
+        lines = pygame.Surface(size)
+        lines.fill(key)
+        lines.set_colorkey(key)
+        width = self.cols * self.cell_size
+        height = self.rows * self.cell_size
+        for i in range(self.rows + 1):
+            y = i * self.cell_size
+            pygame.draw.line(lines, line_color, (0, y), (width, y))
+        for j in range(self.cols + 1):
+            x = j * self.cell_size
+            pygame.draw.line(lines, line_color, (x, 0), (x, height))
+        return lines
+
+    def refresh(self, grid):
+        """
+        Repaints the whole grid.
+        """
+        pixels = self.palette[np.asarray(grid)].transpose(1, 0, 2)
+        block = pygame.surfarray.make_surface(pixels)
+        block = pygame.transform.scale(block, (self.cols * self.cell_size, self.rows * self.cell_size))
+        self.surface.blit(block, (0, 0))
+        self.surface.blit(self.lines, (0, 0))
+        self.needs_refresh = False
+
+    def update(self, grid, changed):
+        """
+        Repaints the cells in `changed` (flat indices i * cols + j, or None for all of them).
+        Falls back to a full refresh when a refresh is pending or so many cells changed that
+        one blit is cheaper.
+        """
+        if self.needs_refresh or changed is None or len(changed) * 8 > self.rows * self.cols:
+            self.refresh(grid)
+            return
+        flat = np.asarray(grid).reshape(-1)
+        size = self.cell_size
+        for k in changed:
+            i, j = divmod(k, self.cols)
+            self.surface.fill(self.palette[flat[k]], (j * size + 1, i * size + 1, size - 1, size - 1))
+
+    def draw(self, screen, position=(0, 0)):
+        screen.blit(self.surface, position)
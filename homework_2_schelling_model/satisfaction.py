@@ -0,0 +1,192 @@
+import numpy as np
+import metrics
+import schelling
+from cellpool import CellPool
+
+# like/total fractions are kept as integer multiples of 1/840: 840 is divisible by every
+# possible neighbor count (1..8), so the running sum stays exact however many moves run
+LIKE_SCALE = 840
+
+class SatisfactionTracker:
+    """
+    Keeps per-cell like/total neighbor counts for a grid up to date as agents move, together
+    with the number of satisfied agents and the pools of unsatisfied and empty cells.
+    A move only touches the 8 neighbors of the cell it leaves and of the cell it enters, so
+    after the one full count at construction every update costs O(1) and the satisfaction
+    ratio never needs a rescan of the grid.
+    Cells in the pools are flat indices (i * cols + j). All moves have to go through move();
+    changing the grid directly leaves the counts stale.
+    'threshold' is shared by all types or has one value per type (see schelling.type_thresholds).
+    The mean like-neighbor fraction and the interface length (see metrics.py) are kept up to
+    date the same way, so the per-step metrics do not need a pass over the grid either.
+    """
+    def __init__(self, rep, threshold=0.5, types=None):
+        self.rep = rep
+        self.threshold = threshold
+        if types is None and not np.ndim(threshold):
+            types = max(int(rep.max()), 1)
+        self.thresholds = schelling.type_thresholds(threshold, types)
+        self.needed_table = schelling.like_needed(self.thresholds)
+        self.needed = self.needed_table.tolist()
+        self.rows, self.cols = rep.shape
+        self.like = np.zeros(rep.shape, dtype=np.int16)
+        self.total = np.zeros(rep.shape, dtype=np.int16)
+        self._scaled = [[like * LIKE_SCALE // total if total else 0 for total in range(schelling.MAX_NEIGHBORS + 1)]
+                        for like in range(schelling.MAX_NEIGHBORS + 1)]
+        # flat views over the same memory: scalar reads and writes give plain ints,
+        # which is several times faster than indexing the NumPy arrays cell by cell
+        self._rep = memoryview(rep).cast("B").cast("b")
+        self._like = memoryview(self.like).cast("B").cast("h")
+        self._total = memoryview(self.total).cast("B").cast("h")
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recounts everything from the grid with one vectorized pass, for after the grid was
+        changed without move() (e.g. a bulk step). Every cell is reported as changed.
+        """
+        rep = self.rep
+        self.like[...], self.total[...] = schelling.neighbor_counts(rep)
+        satisfied = self.like >= self.needed_table[rep, self.total]
+        self.occupied = int(np.count_nonzero(rep))
+        self.satisfied = int(np.count_nonzero(satisfied & (rep != 0)))
+        self.unsatisfied = CellPool(np.flatnonzero(~satisfied).tolist())
+        self.empty = CellPool(np.flatnonzero(rep == 0).tolist())
+        agents = (rep != 0) & (self.total > 0)
+        self.with_neighbors = int(np.count_nonzero(agents))
+        self.like_sum = int((self.like[agents].astype(np.int64) * LIKE_SCALE // self.total[agents]).sum())
+        self.interface = metrics.interface_length(rep)
+        self.chance_like = schelling.chance_like_fraction(rep)
+        # cells moved from or to since the last pop_changed(), for redrawing; None when every cell may have
+        self.changed = None
+
+    def cell(self, k):
+        return divmod(k, self.cols)
+
+    def neighbors(self, k):
+        rows, cols = self.rows, self.cols
+        i, j = divmod(k, cols)
+        result = []
+        for ni in (i - 1, i, i + 1):
+            if 0 <= ni < rows:
+                base = ni * cols
+                for nj in (j - 1, j, j + 1):
+                    if 0 <= nj < cols and (ni != i or nj != j):
+                        result.append(base + nj)
+        return result
+
+    def orthogonal(self, k):
+        rows, cols = self.rows, self.cols
+        i, j = divmod(k, cols)
+        result = []
+        if i > 0:
+            result.append(k - cols)
+        if i < rows - 1:
+            result.append(k + cols)
+        if j > 0:
+            result.append(k - 1)
+        if j < cols - 1:
+            result.append(k + 1)
+        return result
+
+    def is_satisfied(self, k):
+        return self._like[k] >= self.needed[self._rep[k]][self._total[k]]
+
+    def move(self, source, target):
+        """
+        Moves the agent at flat index `source` to the empty cell `target` and updates every count.
+        """
+        rep, like, total = self._rep, self._like, self._total
+        unsatisfied = self.unsatisfied
+        agent = rep[source]
+        source_neighbors = self.neighbors(source)
+        target_neighbors = self.neighbors(target)
+        touched = set(source_neighbors)
+        touched.update(target_neighbors)
+        touched.add(source)
+        touched.add(target)
+        scaled = self._scaled
+        like_sum = self.like_sum
+        with_neighbors = self.with_neighbors
+        before = []
+        for k in touched:
+            if rep[k]:
+                t = total[k]
+                like_sum -= scaled[like[k]][t]
+                with_neighbors -= t > 0
+                before.append((k, k not in unsatisfied.index))
+            else:
+                before.append((k, False))
+
+        interface = self.interface
+        for k in self.orthogonal(source):
+            if rep[k] and rep[k] != agent:
+                interface -= 1
+        rep[source] = 0
+        like[source] = 0
+        for k in source_neighbors:
+            total[k] -= 1
+            if rep[k] == agent:
+                like[k] -= 1
+        rep[target] = agent
+        same = 0
+        for k in target_neighbors:
+            total[k] += 1
+            if rep[k] == agent:
+                like[k] += 1
+                same += 1
+        like[target] = same
+        for k in self.orthogonal(target):
+            if rep[k] and rep[k] != agent:
+                interface += 1
+        self.interface = interface
+        self.empty.remove(target)
+        self.empty.add(source)
+        if self.changed is not None:
+            self.changed.add(source)
+            self.changed.add(target)
+
+        needed = self.needed
+        change = 0
+        for k, was_counted in before:
+            agent = rep[k]
+            if agent:
+                t = total[k]
+                like_sum += scaled[like[k]][t]
+                with_neighbors += t > 0
+            if like[k] >= needed[agent][total[k]]:
+                if k in unsatisfied.index:
+                    unsatisfied.remove(k)
+                change += (agent != 0) - was_counted
+            else:
+                unsatisfied.add(k)
+                change -= was_counted
+        self.satisfied += change
+        self.like_sum = like_sum
+        self.with_neighbors = with_neighbors
+
+    def pop_changed(self):
+        """
+        The set of flat indices moved from or to since the last call, or None when the whole
+        grid has to be redrawn (after construction or rebuild()).
+        """
+        changed = self.changed
+        self.changed = set()
+        return changed
+
+    def ratio(self):
+        return self.satisfied / self.occupied if self.occupied > 0 else 1.0
+
+    def like_fraction(self):
+        """
+        Mean fraction of like-typed neighbors over the agents that have neighbors.
+        """
+        return self.like_sum / (LIKE_SCALE * self.with_neighbors) if self.with_neighbors else 1.0
+
+    def segregation_index(self):
+        """
+        schelling.segregation_index of the grid, from the running counts.
+        """
+        if not self.with_neighbors:
+            return 0.0
+        return schelling.segregation_score(self.like_fraction(), self.chance_like)
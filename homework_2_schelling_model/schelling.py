@@ -1,24 +1,99 @@
 import random
-from config import GRID_ROWS, GRID_COLS, CELL_SIZE, GRID_ORIGIN_X, GRID_ORIGIN_Y, COLOR_EMPTY, COLOR_TYPE1, COLOR_TYPE2, COLOR_GRID_LINE
+import numpy as np
+from cellpool import CellPool
+from config import GRID_ROWS, GRID_COLS, CELL_SIZE, GRID_ORIGIN_X, GRID_ORIGIN_Y, COLOR_EMPTY, TYPE_COLORS, COLOR_GRID_LINE
 
-def initialize_representation(density=0.9):
+# the grid is int8, so type numbers have to fit in 1..127
+MAX_TYPES = 127
+
+def initialize_representation(density=0.9, rows=GRID_ROWS, cols=GRID_COLS, types=2, rng=random):
     """
-    Returns a 2D list (GRID_ROWS x GRID_COLS) where each cell is:
+    Returns a rows x cols NumPy int8 array where each cell is:
       0: empty
       1: agent type 1
       2: agent type 2
+      ... up to 'types'
     Cells are occupied with probability 'density'. When occupied, the agent type is chosen at random.
+    The draws are seeded from 'rng' (the random module or a random.Random), so seeding it makes
+    runs reproducible.
     """
-    rep = []
-    for i in range(GRID_ROWS):
-        row = []
-        for j in range(GRID_COLS):
-            if random.random() < density:
-                row.append(random.choice([1, 2]))
-            else:
-                row.append(0)
-        rep.append(row)
-    return rep
+    if not 1 <= types <= MAX_TYPES:
+        raise ValueError(f"Expected between 1 and {MAX_TYPES} agent types, got {types}")
+    generator = np.random.default_rng(rng.getrandbits(64))
+    occupied = generator.random((rows, cols)) < density
+    agents = generator.integers(1, types + 1, size=(rows, cols), dtype=np.int8)
+    return np.where(occupied, agents, 0).astype(np.int8)
+
+def neighbor_counts(rep):
+    """
+    Returns two int arrays shaped like the grid: for every cell, the number of neighbors of the
+    same type as the cell ('like') and the number of non-empty neighbors ('total'), over the
+    Moore neighborhood (up to 8 neighbors; cells outside the grid count as empty).
+    The whole board is done at once: the grid is padded by one empty cell and each of the 8
+    neighbor offsets is a shifted slice, so there is no Python loop over cells.
+    """
+    rows, cols = rep.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.int8)
+    padded[1:-1, 1:-1] = rep
+    like = np.zeros((rows, cols), dtype=np.int16)
+    total = np.zeros((rows, cols), dtype=np.int16)
+    for di in (-1, 0, 1):
+        for dj in (-1, 0, 1):
+            if di == 0 and dj == 0:
+                continue
+            neighbor = padded[1 + di:rows + 1 + di, 1 + dj:cols + 1 + dj]
+            total += neighbor != 0
+            like += neighbor == rep
+    like[rep == 0] = 0
+    return like, total
+
+MAX_NEIGHBORS = 8
+# with more unsatisfied agents than this fraction of the cells, step() moves them through the
+# vectorized mask and a CellPool and rebuilds the tracker once, which beats ~20 tracked count
+# updates per move
+BULK_FRACTION = 0.02
+
+def type_thresholds(threshold, types=None):
+    """
+    Returns a float32 array where entry t is the threshold of agent type t (entry 0, empty
+    cells, is unused). 'threshold' is either one value shared by every type or a sequence
+    with one value per type, in type order.
+    """
+    values = np.asarray(threshold, dtype=np.float32)
+    if values.ndim == 0:
+        if types is None:
+            raise ValueError("The number of types is needed for a shared threshold")
+        return np.concatenate([[0.0], np.full(types, values)]).astype(np.float32)
+    if types is not None and len(values) != types:
+        raise ValueError(f"Expected {types} thresholds, one per agent type, got {len(values)}")
+    return np.concatenate([[0.0], values]).astype(np.float32)
+
+def like_needed(thresholds):
+    """
+    Turns per-type thresholds into an int8 table: entry [t, n] is the smallest number of like
+    neighbors an agent of type t with n non-empty neighbors needs to be satisfied (n + 1 if
+    it can never be). Satisfaction is then an integer comparison, the same in the vectorized
+    mask and in the incremental tracker, and the fractions are compared in float32 like the
+    thresholds are stored.
+    """
+    needed = np.zeros((len(thresholds), MAX_NEIGHBORS + 1), dtype=np.int8)
+    for t in range(1, len(thresholds)):
+        for n in range(1, MAX_NEIGHBORS + 1):
+            fractions = (np.arange(n + 1) / n).astype(np.float32)
+            reached = np.flatnonzero(fractions >= thresholds[t])
+            needed[t, n] = reached[0] if len(reached) else n + 1
+    return needed
+
+def satisfied_mask(rep, threshold=0.5):
+    """
+    Boolean array, True for every agent that is satisfied (see is_satisfied) and for every empty cell.
+    'threshold' is shared by all types or has one value per type (see type_thresholds); each
+    cell looks up the like count its own type needs, so any number of types costs the same.
+    """
+    like, total = neighbor_counts(rep)
+    types = None if np.ndim(threshold) else max(int(rep.max()), 1)
+    needed = like_needed(type_thresholds(threshold, types))
+    return like >= needed[rep, total]
 
 def is_satisfied(rep, i, j, threshold=0.5):
     """
@@ -26,7 +101,10 @@ def is_satisfied(rep, i, j, threshold=0.5):
     An agent is satisfied if the fraction of like-type neighbors among non-empty neighbors is at least 'threshold'.
     Uses the Moore neighborhood (up to 8 neighbors).
     If an agent has no neighbors, it is considered satisfied.
+    Checks a single cell; use satisfied_mask for the whole grid.
+    'threshold' may also have one value per type.
     """
+    rows, cols = len(rep), len(rep[0])
     agent_type = rep[i][j]
     if agent_type == 0:
         return True
@@ -38,7 +116,7 @@ def is_satisfied(rep, i, j, threshold=0.5):
                 continue
             ni = i + di
             nj = j + dj
-            if 0 <= ni < GRID_ROWS and 0 <= nj < GRID_COLS:
+            if 0 <= ni < rows and 0 <= nj < cols:
                 neighbor = rep[ni][nj]
                 if neighbor != 0:
                     total += 1
@@ -46,32 +124,75 @@ def is_satisfied(rep, i, j, threshold=0.5):
                         like += 1
     if total == 0:
         return True
+    if np.ndim(threshold):
+        threshold = threshold[agent_type - 1]
     return (like / total) >= threshold
 
-def step(rep, threshold=0.5):
+def chance_like_fraction(rep):
+    """
+    The fraction of like neighbors expected under random mixing: the chance of a random
+    neighbor having the same type, i.e. the sum of squared type shares.
+    """
+    counts = np.bincount(rep[rep != 0])
+    shares = counts[counts > 0] / counts.sum()
+    return float((shares ** 2).sum())
+
+def segregation_score(observed, expected):
+    """
+    Rescales an observed mean like-neighbor fraction against the random-mixing one
+    (see segregation_index).
+    """
+    if expected >= 1.0:
+        return 1.0
+    return (observed - expected) / (1.0 - expected)
+
+def segregation_index(rep, like=None, total=None):
+    """
+    How much more like-typed the neighborhoods are than under random mixing:
+    0 when the mean fraction of like neighbors equals the chance of a random neighbor having
+    the same type (sum of squared type shares), 1 when every neighbor is like-typed.
+    Agents without neighbors are ignored. Pass like/total (from neighbor_counts or a
+    SatisfactionTracker) to skip counting the neighbors again.
+    """
+    if like is None or total is None:
+        like, total = neighbor_counts(rep)
+    agents = (rep != 0) & (total > 0)
+    if not agents.any():
+        return 0.0
+    observed = float((like[agents] / total[agents]).mean())
+    return segregation_score(observed, chance_like_fraction(rep))
+
+def step(rep, threshold=0.5, tracker=None, rng=random):
     """
     Executes one step of Schelling’s model:
       - Finds unsatisfied agents.
       - Moves each unsatisfied agent to a randomly chosen empty cell.
     Returns the updated representation.
+    With a SatisfactionTracker for `rep`, the unsatisfied and empty cells come from the tracker
+    and every move updates its counts, so the grid is never rescanned. When more than
+    BULK_FRACTION of the cells are unsatisfied (typically the first steps), the moves go through
+    the vectorized path below instead and the tracker is rebuilt once at the end.
     """
-    unsatisfied = []
-    empty_cells = []
-    for i in range(GRID_ROWS):
-        for j in range(GRID_COLS):
-            if rep[i][j] == 0:
-                empty_cells.append((i, j))
-            else:
-                if not is_satisfied(rep, i, j, threshold):
-                    unsatisfied.append((i, j))
-    random.shuffle(unsatisfied)
+    if tracker is not None:
+        if len(tracker.unsatisfied) <= BULK_FRACTION * rep.size:
+            unsatisfied = list(tracker.unsatisfied)
+            rng.shuffle(unsatisfied)
+            for source in unsatisfied:
+                if tracker.empty:
+                    tracker.move(source, tracker.empty.choice(rng))
+            return rep
+        threshold = tracker.threshold
+    unsatisfied = [tuple(p) for p in np.argwhere(~satisfied_mask(rep, threshold)).tolist()]
+    empty_cells = CellPool(tuple(p) for p in np.argwhere(rep == 0).tolist())
+    rng.shuffle(unsatisfied)
     for (i, j) in unsatisfied:
         if empty_cells:
-            new_pos = random.choice(empty_cells)
-            empty_cells.remove(new_pos)
-            rep[new_pos[0]][new_pos[1]] = rep[i][j]
-            rep[i][j] = 0
-            empty_cells.append((i, j))
+            new_pos = empty_cells.pop_random(rng)
+            rep[new_pos] = rep[i, j]
+            rep[i, j] = 0
+            empty_cells.add((i, j))
+    if tracker is not None:
+        tracker.rebuild()
     return rep
 
 def plot(rep, surface):
@@ -81,24 +202,21 @@ def plot(rep, surface):
     Grid lines are also drawn.
     """
     import pygame
-    for i in range(GRID_ROWS):
-        for j in range(GRID_COLS):
+    rows, cols = rep.shape
+    for i in range(rows):
+        for j in range(cols):
             cell = rep[i][j]
-            if cell == 0:
-                color = COLOR_EMPTY
-            elif cell == 1:
-                color = COLOR_TYPE1
-            elif cell == 2:
-                color = COLOR_TYPE2
+            if 0 < cell <= len(TYPE_COLORS):
+                color = TYPE_COLORS[cell - 1]
             else:
                 color = COLOR_EMPTY
             x = GRID_ORIGIN_X + j * CELL_SIZE
             y = GRID_ORIGIN_Y + i * CELL_SIZE
             rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
             pygame.draw.rect(surface, color, rect)
-    for i in range(GRID_ROWS + 1):
+    for i in range(rows + 1):
         y = GRID_ORIGIN_Y + i * CELL_SIZE
-        pygame.draw.line(surface, COLOR_GRID_LINE, (GRID_ORIGIN_X, y), (GRID_ORIGIN_X + GRID_COLS * CELL_SIZE, y))
-    for j in range(GRID_COLS + 1):
+        pygame.draw.line(surface, COLOR_GRID_LINE, (GRID_ORIGIN_X, y), (GRID_ORIGIN_X + cols * CELL_SIZE, y))
+    for j in range(cols + 1):
         x = GRID_ORIGIN_X + j * CELL_SIZE
-        pygame.draw.line(surface, COLOR_GRID_LINE, (x, GRID_ORIGIN_Y), (x, GRID_ORIGIN_Y + GRID_ROWS * CELL_SIZE))
+        pygame.draw.line(surface, COLOR_GRID_LINE, (x, GRID_ORIGIN_Y), (x, GRID_ORIGIN_Y + rows * CELL_SIZE))